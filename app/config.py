@@ -4,13 +4,50 @@ Usa Pydantic Settings para validação e tipagem.
 """
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import Literal, Optional
+import os
+from functools import cache, cached_property
+from typing import Any, Literal, Optional
 
-from pydantic import Field, field_validator
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class SaiposSettings(BaseSettings):
+    """Configurações da integração Saipos (PDV).
+
+    Carregadas sob demanda via `Settings.saipos` — processos que nunca
+    tocam o Saipos não pagam a validação destes campos.
+    """
+
+    model_config = SettingsConfigDict(
+        env_prefix="saipos_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+    base_url: str = "https://api.saipos.com"
+    partner_id: Optional[str] = None
+    partner_secret: Optional[str] = None
+    cod_store: Optional[str] = None
+    display_id: Optional[str] = None
+
+
+class GoogleMapsSettings(BaseSettings):
+    """Configurações do Google Maps (geocoding). Carregadas sob demanda."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="google_maps_",
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+    api_key: Optional[str] = None
+
+
 class Settings(BaseSettings):
     """Configurações da aplicação carregadas do ambiente."""
     
@@ -19,14 +56,16 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         case_sensitive=False,
         extra="ignore",
+        frozen=True,  # Imutável => hasheável, pode ser chave de memoização
     )
-    
+
     # ==========================================
     # Ambiente
     # ==========================================
     environment: Literal["development", "staging", "production"] = "development"
     debug: bool = True
-    log_level: str = "INFO"
+    # Literal => validação de membership roda no pydantic-core (Rust)
+    log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
     
     # ==========================================
     # Supabase
@@ -48,20 +87,6 @@ class Settings(BaseSettings):
     evolution_api_key: str = Field(..., description="API key da Evolution")
     evolution_instance: str = "Lia"
     
-    # ==========================================
-    # Saipos (PDV) - Opcional em desenvolvimento
-    # ==========================================
-    saipos_base_url: str = "https://api.saipos.com"
-    saipos_partner_id: Optional[str] = None
-    saipos_partner_secret: Optional[str] = None
-    saipos_cod_store: Optional[str] = None
-    saipos_display_id: Optional[str] = None
-    
-    # ==========================================
-    # Google Maps
-    # ==========================================
-    google_maps_api_key: Optional[str] = None
-    
     # ==========================================
     # Configurações do Agente
     # ==========================================
@@ -69,6 +94,9 @@ class Settings(BaseSettings):
     max_correction_attempts: int = 3
     followup_timeout_minutes: int = 10
     default_tenant: str = "marcio-lanches"
+    # Por quanto tempo o /ready reaproveita o último check de banco (probes
+    # do Kubernetes não viram carga contínua no Supabase)
+    readiness_cache_ttl: float = 10.0
     
     # ==========================================
     # Propriedades computadas
@@ -81,26 +109,47 @@ class Settings(BaseSettings):
     def is_development(self) -> bool:
         return self.environment == "development"
     
+    # ==========================================
+    # Integrações opcionais (lazy)
+    # ==========================================
+    @cached_property
+    def saipos(self) -> SaiposSettings:
+        """Configurações Saipos, validadas apenas no primeiro acesso."""
+        return SaiposSettings()
+
+    @cached_property
+    def google_maps(self) -> GoogleMapsSettings:
+        """Configurações Google Maps, validadas apenas no primeiro acesso."""
+        return GoogleMapsSettings()
+
     @property
     def saipos_enabled(self) -> bool:
         """Verifica se integração Saipos está configurada."""
-        return bool(self.saipos_partner_id and self.saipos_partner_secret)
+        # Fast path: checa o ambiente sem construir o submodelo
+        if os.environ.get("SAIPOS_PARTNER_ID") and os.environ.get("SAIPOS_PARTNER_SECRET"):
+            return True
+        return bool(self.saipos.partner_id and self.saipos.partner_secret)
     
-    @field_validator("log_level")
+    @model_validator(mode="before")
     @classmethod
-    def validate_log_level(cls, v: str) -> str:
-        valid = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
-        upper = v.upper()
-        if upper not in valid:
-            raise ValueError(f"log_level deve ser um de: {valid}")
-        return upper
+    def uppercase_log_level(cls, data: Any) -> Any:
+        """Aceita log_level em minúsculas antes do validador Literal."""
+        if isinstance(data, dict):
+            level = data.get("log_level")
+            if isinstance(level, str) and not level.isupper():
+                data["log_level"] = level.upper()
+        return data
 
 
-@lru_cache
+@cache
 def get_settings() -> Settings:
-    """Retorna instância singleton das configurações."""
+    """Retorna instância singleton das configurações.
+
+    `cache` em vez de `lru_cache`: sem argumentos não há o que evitar,
+    e o caminho do `cache` dispensa a contabilidade LRU.
+    """
     return Settings()
 
 
-# Alias para importação mais fácil
+# Alias para importação mais fácil (preferir importar `settings` diretamente)
 settings = get_settings()
\ No newline at end of file
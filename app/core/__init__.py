@@ -1,18 +1,33 @@
 """
 Core module - Componentes fundamentais do sistema.
+
+Exports são resolvidos de forma lazy (PEP 562): importar `app.core` não
+carrega fsm/schemas/guardrails (e seus regexes compilados, structlog,
+classes Pydantic) até o primeiro acesso — cold-start mais rápido para
+workers que só usam um dos submódulos.
 """
 from __future__ import annotations
 
-from app.core.fsm import ConversationState, FSM, StateTransition
-from app.core.schemas import (
-    CartItem,
-    CartItemAddition,
-    CartPendency,
-    CartState,
-    OrderItem,
-    PaymentDetails,
-)
-from app.core.guardrails import InputGuardrails, QuickIntent
+from importlib import import_module
+from typing import Any
+
+# Export -> submódulo que o define
+_EXPORTS = {
+    # FSM
+    "ConversationState": "app.core.fsm",
+    "FSM": "app.core.fsm",
+    "StateTransition": "app.core.fsm",
+    # Schemas
+    "CartItem": "app.core.schemas",
+    "CartItemAddition": "app.core.schemas",
+    "CartPendency": "app.core.schemas",
+    "CartState": "app.core.schemas",
+    "OrderItem": "app.core.schemas",
+    "PaymentDetails": "app.core.schemas",
+    # Guardrails
+    "InputGuardrails": "app.core.guardrails",
+    "QuickIntent": "app.core.guardrails",
+}
 
 __all__ = [
     # FSM
@@ -30,3 +45,17 @@ __all__ = [
     "InputGuardrails",
     "QuickIntent",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    # Cacheia no namespace do pacote: próximos acessos não passam por aqui
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
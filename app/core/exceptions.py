@@ -15,12 +15,66 @@ Hierarquia:
 """
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from enum import Enum
+from typing import Any, ClassVar, Dict, List, Optional
+
+
+class ErrorCode(str, Enum):
+    """Códigos de erro do sistema.
+
+    Membros de enum são singletons: comparação vira pointer-compare e o
+    hash é cacheado, em vez de comparar/hashear strings soltas.
+    A base `str` mantém a serialização JSON como string.
+    """
+
+    LIA_ERROR = "LIA_ERROR"
+    VALIDATION_ERROR = "VALIDATION_ERROR"
+    SCHEMA_VALIDATION_ERROR = "SCHEMA_VALIDATION_ERROR"
+    FSM_ERROR = "FSM_ERROR"
+    INVALID_TRANSITION = "INVALID_TRANSITION"
+    INTEGRATION_ERROR = "INTEGRATION_ERROR"
+    EVOLUTION_ERROR = "EVOLUTION_ERROR"
+    SAIPOS_ERROR = "SAIPOS_ERROR"
+    OPENAI_ERROR = "OPENAI_ERROR"
+    GOOGLE_MAPS_ERROR = "GOOGLE_MAPS_ERROR"
+    CART_ERROR = "CART_ERROR"
+    ITEM_NOT_FOUND = "ITEM_NOT_FOUND"
+    ADDITION_NOT_ALLOWED = "ADDITION_NOT_ALLOWED"
+    ORDER_ERROR = "ORDER_ERROR"
+    ORDER_VALIDATION_ERROR = "ORDER_VALIDATION_ERROR"
+    ORDER_SUBMISSION_ERROR = "ORDER_SUBMISSION_ERROR"
+    SESSION_ERROR = "SESSION_ERROR"
+    SESSION_NOT_FOUND = "SESSION_NOT_FOUND"
+    SESSION_EXPIRED = "SESSION_EXPIRED"
+
+
+class Service(str, Enum):
+    """Serviços externos integrados."""
+
+    EVOLUTION = "evolution"
+    SAIPOS = "saipos"
+    OPENAI = "openai"
+    GOOGLE_MAPS = "google_maps"
+
+
+def _truncate_response(response: Any) -> str:
+    """Trunca resposta para os detalhes do erro sem copiar strings curtas."""
+    if isinstance(response, str):
+        return response if len(response) <= 500 else response[:500]
+    return str(response)[:500]
 
 
 class LiaError(Exception):
     """Exceção base do sistema."""
-    
+
+    # Slots: atributos ficam fora do __dict__ lazy da Exception,
+    # reduzindo o custo de alocação em caminhos de retry barulhentos
+    __slots__ = ("message", "details", "_as_dict")
+
+    # Código default a nível de classe: evita um write de atributo por
+    # raise; subclasses apenas redefinem o ClassVar
+    code: ClassVar[str] = ErrorCode.LIA_ERROR
+
     def __init__(
         self,
         message: str,
@@ -28,16 +82,22 @@ class LiaError(Exception):
         details: Optional[Dict[str, Any]] = None,
     ):
         self.message = message
-        self.code = code or "LIA_ERROR"
+        if code is not None:
+            self.code = code
         self.details = details or {}
         super().__init__(message)
     
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "error": self.code,
-            "message": self.message,
-            "details": self.details,
-        }
+        # Memoizado: logging + corpo da resposta serializam o mesmo erro
+        cached = getattr(self, "_as_dict", None)
+        if cached is None:
+            cached = {
+                "error": self.code,
+                "message": self.message,
+                "details": self.details,
+            }
+            self._as_dict = cached
+        return cached
 
 
 # ==========================================
@@ -46,6 +106,10 @@ class LiaError(Exception):
 
 class ValidationError(LiaError):
     """Erro de validação de dados."""
+
+    __slots__ = ("field", "value")
+
+    code: ClassVar[str] = ErrorCode.VALIDATION_ERROR
     
     def __init__(
         self,
@@ -61,7 +125,6 @@ class ValidationError(LiaError):
         
         super().__init__(
             message=message,
-            code="VALIDATION_ERROR",
             details=details,
         )
         self.field = field
@@ -70,10 +133,13 @@ class ValidationError(LiaError):
 
 class SchemaValidationError(ValidationError):
     """Erro de validação de schema Pydantic."""
+
+    __slots__ = ()
+
+    code: ClassVar[str] = ErrorCode.SCHEMA_VALIDATION_ERROR
     
     def __init__(self, message: str, errors: List[Dict[str, Any]]):
         super().__init__(message=message)
-        self.code = "SCHEMA_VALIDATION_ERROR"
         self.details["errors"] = errors
 
 
@@ -83,6 +149,10 @@ class SchemaValidationError(ValidationError):
 
 class FSMError(LiaError):
     """Erro relacionado à máquina de estados."""
+
+    __slots__ = ()
+
+    code: ClassVar[str] = ErrorCode.FSM_ERROR
     
     def __init__(
         self,
@@ -98,13 +168,16 @@ class FSMError(LiaError):
         
         super().__init__(
             message=message,
-            code="FSM_ERROR",
             details=details,
         )
 
 
 class InvalidTransitionError(FSMError):
     """Transição de estado não permitida."""
+
+    __slots__ = ()
+
+    code: ClassVar[str] = ErrorCode.INVALID_TRANSITION
     
     def __init__(
         self,
@@ -118,7 +191,6 @@ class InvalidTransitionError(FSMError):
             from_state=from_state,
             to_state=to_state,
         )
-        self.code = "INVALID_TRANSITION"
         if allowed:
             self.details["allowed_transitions"] = allowed
 
@@ -128,100 +200,104 @@ class InvalidTransitionError(FSMError):
 # ==========================================
 
 class IntegrationError(LiaError):
-    """Erro de integração com serviço externo."""
-    
+    """Erro de integração com serviço externo.
+
+    Subclasses são declaradas de forma data-driven:
+
+        class EvolutionError(IntegrationError, service=Service.EVOLUTION,
+                             code=ErrorCode.EVOLUTION_ERROR): ...
+
+    __init_subclass__ registra service/code como atributos de classe, então
+    um raise executa um único frame de __init__ (o da base).
+    """
+
+    __slots__ = ("status_code",)
+
+    code: ClassVar[str] = ErrorCode.INTEGRATION_ERROR
+    service: ClassVar[Optional[str]] = None
+
+    def __init_subclass__(
+        cls,
+        *,
+        service: Optional[str] = None,
+        code: Optional[str] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init_subclass__(**kwargs)
+        if service is not None:
+            cls.service = service
+        if code is not None:
+            cls.code = code
+
     def __init__(
         self,
         message: str,
-        service: str,
+        *,
+        service: Optional[str] = None,
         status_code: Optional[int] = None,
         response: Any = None,
     ):
-        details = {"service": service}
-        if status_code:
-            details["status_code"] = status_code
-        if response:
-            details["response"] = str(response)[:500]
-        
+        if service is None:
+            service = type(self).service
+
+        # Dict único, sem inserts incrementais nem truncagem redundante
+        details = {
+            key: value
+            for key, value in (
+                ("service", service),
+                ("status_code", status_code),
+                ("response", _truncate_response(response) if response else None),
+            )
+            if value is not None
+        }
+
         super().__init__(
             message=message,
-            code="INTEGRATION_ERROR",
             details=details,
         )
-        self.service = service
+        if service is not type(self).service:
+            self.service = service
         self.status_code = status_code
 
 
-class EvolutionError(IntegrationError):
+class EvolutionError(
+    IntegrationError,
+    service=Service.EVOLUTION,
+    code=ErrorCode.EVOLUTION_ERROR,
+):
     """Erro da Evolution API (WhatsApp)."""
-    
-    def __init__(
-        self,
-        message: str,
-        status_code: Optional[int] = None,
-        response: Any = None,
-    ):
-        super().__init__(
-            message=message,
-            service="evolution",
-            status_code=status_code,
-            response=response,
-        )
-        self.code = "EVOLUTION_ERROR"
+
+    __slots__ = ()
 
 
-class SaiposError(IntegrationError):
+class SaiposError(
+    IntegrationError,
+    service=Service.SAIPOS,
+    code=ErrorCode.SAIPOS_ERROR,
+):
     """Erro da API Saipos."""
-    
-    def __init__(
-        self,
-        message: str,
-        status_code: Optional[int] = None,
-        response: Any = None,
-    ):
-        super().__init__(
-            message=message,
-            service="saipos",
-            status_code=status_code,
-            response=response,
-        )
-        self.code = "SAIPOS_ERROR"
+
+    __slots__ = ()
 
 
-class OpenAIError(IntegrationError):
+class OpenAIError(
+    IntegrationError,
+    service=Service.OPENAI,
+    code=ErrorCode.OPENAI_ERROR,
+):
     """Erro da API OpenAI."""
-    
-    def __init__(
-        self,
-        message: str,
-        status_code: Optional[int] = None,
-        response: Any = None,
-    ):
-        super().__init__(
-            message=message,
-            service="openai",
-            status_code=status_code,
-            response=response,
-        )
-        self.code = "OPENAI_ERROR"
+
+    __slots__ = ()
 
 
-class GoogleMapsError(IntegrationError):
+class GoogleMapsError(
+    IntegrationError,
+    service=Service.GOOGLE_MAPS,
+    code=ErrorCode.GOOGLE_MAPS_ERROR,
+):
     """Erro da API Google Maps."""
-    
-    def __init__(
-        self,
-        message: str,
-        status_code: Optional[int] = None,
-        response: Any = None,
-    ):
-        super().__init__(
-            message=message,
-            service="google_maps",
-            status_code=status_code,
-            response=response,
-        )
-        self.code = "GOOGLE_MAPS_ERROR"
+
+    __slots__ = ()
 
 
 # ==========================================
@@ -230,17 +306,24 @@ class GoogleMapsError(IntegrationError):
 
 class CartError(LiaError):
     """Erro relacionado ao carrinho."""
-    
+
+    __slots__ = ()
+
+    code: ClassVar[str] = ErrorCode.CART_ERROR
+
     def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
         super().__init__(
             message=message,
-            code="CART_ERROR",
             details=details or {},
         )
 
 
 class ItemNotFoundError(CartError):
     """Item não encontrado no cardápio."""
+
+    __slots__ = ("suggestions",)
+
+    code: ClassVar[str] = ErrorCode.ITEM_NOT_FOUND
     
     def __init__(
         self,
@@ -255,12 +338,15 @@ class ItemNotFoundError(CartError):
             message=f"Item não encontrado: {item_text}",
             details=details,
         )
-        self.code = "ITEM_NOT_FOUND"
         self.suggestions = suggestions or []
 
 
 class AdditionNotAllowedError(CartError):
     """Adicional não permitido para este produto."""
+
+    __slots__ = ()
+
+    code: ClassVar[str] = ErrorCode.ADDITION_NOT_ALLOWED
     
     def __init__(
         self,
@@ -279,7 +365,6 @@ class AdditionNotAllowedError(CartError):
             message=f"'{addition_name}' não é permitido para '{product_name}'",
             details=details,
         )
-        self.code = "ADDITION_NOT_ALLOWED"
 
 
 # ==========================================
@@ -288,17 +373,24 @@ class AdditionNotAllowedError(CartError):
 
 class OrderError(LiaError):
     """Erro relacionado ao pedido."""
+
+    __slots__ = ()
+
+    code: ClassVar[str] = ErrorCode.ORDER_ERROR
     
     def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
         super().__init__(
             message=message,
-            code="ORDER_ERROR",
             details=details or {},
         )
 
 
 class OrderValidationError(OrderError):
     """Pedido inválido para envio."""
+
+    __slots__ = ()
+
+    code: ClassVar[str] = ErrorCode.ORDER_VALIDATION_ERROR
     
     def __init__(self, message: str, missing_fields: Optional[List[str]] = None):
         details = {}
@@ -306,11 +398,14 @@ class OrderValidationError(OrderError):
             details["missing_fields"] = missing_fields
         
         super().__init__(message=message, details=details)
-        self.code = "ORDER_VALIDATION_ERROR"
 
 
 class OrderSubmissionError(OrderError):
     """Erro ao enviar pedido para o Saipos."""
+
+    __slots__ = ()
+
+    code: ClassVar[str] = ErrorCode.ORDER_SUBMISSION_ERROR
     
     def __init__(
         self,
@@ -322,7 +417,6 @@ class OrderSubmissionError(OrderError):
             details["saipos_error"] = saipos_error
         
         super().__init__(message=message, details=details)
-        self.code = "ORDER_SUBMISSION_ERROR"
 
 
 # ==========================================
@@ -331,6 +425,10 @@ class OrderSubmissionError(OrderError):
 
 class SessionError(LiaError):
     """Erro relacionado à sessão."""
+
+    __slots__ = ()
+
+    code: ClassVar[str] = ErrorCode.SESSION_ERROR
     
     def __init__(self, message: str, session_id: Optional[str] = None):
         details = {}
@@ -339,28 +437,33 @@ class SessionError(LiaError):
         
         super().__init__(
             message=message,
-            code="SESSION_ERROR",
             details=details,
         )
 
 
 class SessionNotFoundError(SessionError):
     """Sessão não encontrada."""
+
+    __slots__ = ()
+
+    code: ClassVar[str] = ErrorCode.SESSION_NOT_FOUND
     
     def __init__(self, session_id: str):
         super().__init__(
             message=f"Sessão não encontrada: {session_id}",
             session_id=session_id,
         )
-        self.code = "SESSION_NOT_FOUND"
 
 
 class SessionExpiredError(SessionError):
     """Sessão expirada."""
+
+    __slots__ = ()
+
+    code: ClassVar[str] = ErrorCode.SESSION_EXPIRED
     
     def __init__(self, session_id: str):
         super().__init__(
             message=f"Sessão expirada: {session_id}",
             session_id=session_id,
         )
-        self.code = "SESSION_EXPIRED"
@@ -9,18 +9,31 @@ A FSM garante que:
 """
 from __future__ import annotations
 
+import logging
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Optional
 
+import orjson
 import structlog
 
-logger = structlog.get_logger()
+# Contexto "component=fsm" resolvido uma vez (proxy lazy: só materializa
+# no primeiro uso, depois do configure() em app.main)
+logger = structlog.get_logger("fsm").bind(component="fsm")
 
+# Logger stdlib correspondente, para checagem barata de nível antes de
+# montar payloads estruturados
+_std_logger = logging.getLogger("fsm")
 
-class ConversationState(str, Enum):
+
+class ConversationState(Enum):
     """Estados possíveis da conversa.
-    
+
+    Enum puro (sem mixin str): comparação e hash são por identidade,
+    não por conteúdo de string. Nas bordas de serialização use `.value`
+    e `from_str()`.
+
     Fluxo típico:
     GREETING → COLLECTING_ITEMS → CONFIRMING_ITEMS → COLLECTING_DELIVERY_TYPE
     → COLLECTING_ADDRESS → CONFIRMING_ADDRESS → COLLECTING_PAYMENT
@@ -59,17 +72,26 @@ class ConversationState(str, Enum):
     # Cancelamento
     CANCELLED = "CANCELLED"
 
+    @classmethod
+    def from_str(cls, value: str) -> "ConversationState":
+        """Desserializa estado vindo do banco/JSON (lookup O(1))."""
+        return cls._value2member_map_[value]  # type: ignore[return-value]
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StateRequirements:
-    """Requisitos e metadados de um estado."""
-    
+    """Requisitos e metadados de um estado.
+
+    Config estática: frozen + slots + tuplas eliminam listas mutáveis
+    por instância e aceleram o acesso a atributos lido a cada turno.
+    """
+
     # Campos obrigatórios no collected_data para entrar neste estado
-    required_fields: List[str] = field(default_factory=list)
-    
+    required_fields: tuple[str, ...] = ()
+
     # Estados para os quais pode transicionar
-    allowed_transitions: List[ConversationState] = field(default_factory=list)
-    
+    allowed_transitions: tuple[ConversationState, ...] = ()
+
     # Prompt hint para o agente
     agent_hint: str = ""
     
@@ -87,138 +109,282 @@ class StateRequirements:
 STATE_MACHINE: Dict[ConversationState, StateRequirements] = {
     
     ConversationState.GREETING: StateRequirements(
-        required_fields=[],
-        allowed_transitions=[
+        required_fields=(),
+        allowed_transitions=(
             ConversationState.COLLECTING_ITEMS,
             ConversationState.CANCELLED,
-        ],
+        ),
         agent_hint="Cumprimente o cliente e pergunte o que ele gostaria de pedir.",
         can_receive_items=True,  # Cliente pode já pedir no greeting
     ),
     
     ConversationState.COLLECTING_ITEMS: StateRequirements(
-        required_fields=[],
-        allowed_transitions=[
+        required_fields=(),
+        allowed_transitions=(
             ConversationState.CONFIRMING_ITEMS,
             ConversationState.RESOLVING_PENDING,
             ConversationState.CANCELLED,
-        ],
+        ),
         agent_hint="Colete os itens do pedido. Quando o cliente terminar, confirme o pedido.",
         can_receive_items=True,
     ),
     
     ConversationState.CONFIRMING_ITEMS: StateRequirements(
-        required_fields=["cart_has_items"],
-        allowed_transitions=[
+        required_fields=("cart_has_items",),
+        allowed_transitions=(
             ConversationState.COLLECTING_ITEMS,      # Cliente quer alterar
             ConversationState.COLLECTING_DELIVERY_TYPE,  # Confirmado
             ConversationState.CANCELLED,
-        ],
+        ),
         agent_hint="Mostre o resumo do pedido e peça confirmação.",
         can_receive_items=True,  # Cliente pode adicionar mais
     ),
     
     ConversationState.RESOLVING_PENDING: StateRequirements(
-        required_fields=["cart_has_pendencies"],
-        allowed_transitions=[
+        required_fields=("cart_has_pendencies",),
+        allowed_transitions=(
             ConversationState.COLLECTING_ITEMS,
             ConversationState.CONFIRMING_ITEMS,
             ConversationState.CANCELLED,
-        ],
+        ),
         agent_hint="Há itens não encontrados. Apresente as sugestões e peça esclarecimento.",
         can_receive_items=True,
     ),
     
     ConversationState.COLLECTING_DELIVERY_TYPE: StateRequirements(
-        required_fields=["items_confirmed"],
-        allowed_transitions=[
+        required_fields=("items_confirmed",),
+        allowed_transitions=(
             ConversationState.COLLECTING_ADDRESS,    # Delivery
             ConversationState.COLLECTING_PAYMENT,    # Retirada
             ConversationState.COLLECTING_ITEMS,      # Voltar a editar
             ConversationState.CANCELLED,
-        ],
+        ),
         agent_hint="Pergunte se será entrega ou retirada no balcão.",
     ),
     
     ConversationState.COLLECTING_ADDRESS: StateRequirements(
-        required_fields=["delivery_type"],
-        allowed_transitions=[
+        required_fields=("delivery_type",),
+        allowed_transitions=(
             ConversationState.CONFIRMING_ADDRESS,
             ConversationState.CANCELLED,
-        ],
+        ),
         agent_hint="Colete o endereço de entrega completo.",
     ),
     
     ConversationState.CONFIRMING_ADDRESS: StateRequirements(
-        required_fields=["delivery_address"],
-        allowed_transitions=[
+        required_fields=("delivery_address",),
+        allowed_transitions=(
             ConversationState.COLLECTING_ADDRESS,    # Corrigir
             ConversationState.COLLECTING_PAYMENT,    # Confirmado
             ConversationState.CANCELLED,
-        ],
+        ),
         agent_hint="Confirme o endereço e informe a taxa de entrega.",
     ),
     
     ConversationState.COLLECTING_PAYMENT: StateRequirements(
-        required_fields=["delivery_type"],  # E address se for delivery
-        allowed_transitions=[
+        required_fields=("delivery_type",),  # E address se for delivery
+        allowed_transitions=(
             ConversationState.COLLECTING_PAYMENT_DETAILS,
             ConversationState.CONFIRMING_ORDER,      # Se não precisa detalhes
             ConversationState.CANCELLED,
-        ],
+        ),
         agent_hint="Pergunte a forma de pagamento.",
     ),
     
     ConversationState.COLLECTING_PAYMENT_DETAILS: StateRequirements(
-        required_fields=["payment_method"],
-        allowed_transitions=[
+        required_fields=("payment_method",),
+        allowed_transitions=(
             ConversationState.AWAITING_PIX_PROOF,    # Se PIX
             ConversationState.CONFIRMING_ORDER,      # Outros
             ConversationState.COLLECTING_PAYMENT,    # Trocar forma
             ConversationState.CANCELLED,
-        ],
+        ),
         agent_hint="Colete detalhes do pagamento (troco, etc).",
     ),
     
     ConversationState.AWAITING_PIX_PROOF: StateRequirements(
-        required_fields=["payment_method"],
-        allowed_transitions=[
+        required_fields=("payment_method",),
+        allowed_transitions=(
             ConversationState.CONFIRMING_ORDER,
             ConversationState.COLLECTING_PAYMENT,    # Trocar forma
             ConversationState.CANCELLED,
-        ],
+        ),
         agent_hint="Aguardando comprovante PIX. Valide quando recebido.",
         timeout_minutes=15,  # PIX tem timeout maior
     ),
     
     ConversationState.CONFIRMING_ORDER: StateRequirements(
-        required_fields=["items_confirmed", "delivery_type", "payment_method"],
-        allowed_transitions=[
+        required_fields=("items_confirmed", "delivery_type", "payment_method",),
+        allowed_transitions=(
             ConversationState.ORDER_SENT,
             ConversationState.COLLECTING_ITEMS,      # Alterar pedido
             ConversationState.COLLECTING_PAYMENT,    # Alterar pagamento
             ConversationState.CANCELLED,
-        ],
+        ),
         agent_hint="Mostre resumo final e peça confirmação para enviar.",
     ),
     
     ConversationState.ORDER_SENT: StateRequirements(
-        required_fields=["order_confirmed"],
-        allowed_transitions=[],  # Terminal
+        required_fields=("order_confirmed",),
+        allowed_transitions=(),  # Terminal
         agent_hint="Pedido enviado! Agradeça e informe tempo estimado.",
         is_terminal=True,
     ),
     
     ConversationState.CANCELLED: StateRequirements(
-        required_fields=[],
-        allowed_transitions=[],  # Terminal
+        required_fields=(),
+        allowed_transitions=(),  # Terminal
         agent_hint="Conversa cancelada. Agradeça e se despeça.",
         is_terminal=True,
     ),
 }
 
 
-@dataclass
+# Lookups achatados, pré-computados a partir de STATE_MACHINE no import
+# ("parse-once, index-after"): membership O(1) em vez de scan linear da lista.
+_ALLOWED_SETS: Dict[ConversationState, frozenset[ConversationState]] = {
+    state: frozenset(req.allowed_transitions) for state, req in STATE_MACHINE.items()
+}
+
+_TERMINAL_STATES: frozenset[ConversationState] = frozenset(
+    state for state, req in STATE_MACHINE.items() if req.is_terminal
+)
+
+_CAN_RECEIVE_ITEMS: frozenset[ConversationState] = frozenset(
+    state for state, req in STATE_MACHINE.items() if req.can_receive_items
+)
+
+# Parte estática do contexto de prompt por estado (tudo menos state_data).
+# Tuplas imutáveis permitem compartilhar o dict base sem cópia defensiva.
+_PROMPT_CONTEXT_BASE: Dict[ConversationState, Dict[str, Any]] = {
+    state: {
+        "estado_atual": state.value,
+        "estados_permitidos": tuple(s.value for s in req.allowed_transitions),
+        "hint": req.agent_hint,
+        "pode_receber_itens": req.can_receive_items,
+        "eh_terminal": req.is_terminal,
+    }
+    for state, req in STATE_MACHINE.items()
+}
+
+# Fragmento JSON pré-serializado do contexto estático: o `}` final é
+# trocado pela chave de dados_estado, faltando só o JSON dinâmico + `}`
+_PROMPT_JSON_BASE: Dict[ConversationState, bytes] = {
+    state: orjson.dumps(base)[:-1] + b',"dados_estado":'
+    for state, base in _PROMPT_CONTEXT_BASE.items()
+}
+
+
+# ==========================================
+# Handlers de sugestão de próximo estado
+# ==========================================
+# Cada handler olha apenas os kwargs relevantes ao seu estado;
+# suggest_next_state vira um lookup + chamada.
+
+def _suggest_from_greeting(*, cart_has_items: bool, **_: Any) -> Optional[ConversationState]:
+    if cart_has_items:
+        return ConversationState.COLLECTING_ITEMS
+    return None
+
+
+def _suggest_from_collecting_items(
+    *, cart_has_pendencies: bool, items_confirmed: bool, **_: Any
+) -> Optional[ConversationState]:
+    if cart_has_pendencies:
+        return ConversationState.RESOLVING_PENDING
+    if items_confirmed:
+        return ConversationState.COLLECTING_DELIVERY_TYPE
+    return None
+
+
+def _suggest_from_confirming_items(*, items_confirmed: bool, **_: Any) -> Optional[ConversationState]:
+    if items_confirmed:
+        return ConversationState.COLLECTING_DELIVERY_TYPE
+    return None
+
+
+def _suggest_from_resolving_pending(
+    *, cart_has_pendencies: bool, cart_has_items: bool, **_: Any
+) -> Optional[ConversationState]:
+    if not cart_has_pendencies:
+        if cart_has_items:
+            return ConversationState.CONFIRMING_ITEMS
+        return ConversationState.COLLECTING_ITEMS
+    return None
+
+
+def _suggest_from_delivery_type(
+    *, delivery_type: Optional[str], **_: Any
+) -> Optional[ConversationState]:
+    if delivery_type == "pickup":
+        return ConversationState.COLLECTING_PAYMENT
+    if delivery_type == "delivery":
+        return ConversationState.COLLECTING_ADDRESS
+    return None
+
+
+def _suggest_from_collecting_address(*, address_provided: bool, **_: Any) -> Optional[ConversationState]:
+    if address_provided:
+        return ConversationState.CONFIRMING_ADDRESS
+    return None
+
+
+def _suggest_from_confirming_address(*, address_confirmed: bool, **_: Any) -> Optional[ConversationState]:
+    if address_confirmed:
+        return ConversationState.COLLECTING_PAYMENT
+    return None
+
+
+def _suggest_from_collecting_payment(
+    *, payment_method: Optional[str], **_: Any
+) -> Optional[ConversationState]:
+    if not payment_method:
+        return None
+    # PIX sempre precisa de comprovante; dinheiro precisa perguntar troco
+    if payment_method in ("pix", "dinheiro"):
+        return ConversationState.COLLECTING_PAYMENT_DETAILS
+    # Cartão vai direto para confirmar
+    return ConversationState.CONFIRMING_ORDER
+
+
+def _suggest_from_payment_details(
+    *, payment_method: Optional[str], payment_details_complete: bool, **_: Any
+) -> Optional[ConversationState]:
+    if payment_method == "pix":
+        return ConversationState.AWAITING_PIX_PROOF
+    if payment_details_complete:
+        return ConversationState.CONFIRMING_ORDER
+    return None
+
+
+def _suggest_from_awaiting_pix(*, pix_proof_validated: bool, **_: Any) -> Optional[ConversationState]:
+    if pix_proof_validated:
+        return ConversationState.CONFIRMING_ORDER
+    return None
+
+
+def _suggest_from_confirming_order(*, order_confirmed: bool, **_: Any) -> Optional[ConversationState]:
+    if order_confirmed:
+        return ConversationState.ORDER_SENT
+    return None
+
+
+_SUGGEST_HANDLERS: Dict[ConversationState, Callable[..., Optional[ConversationState]]] = {
+    ConversationState.GREETING: _suggest_from_greeting,
+    ConversationState.COLLECTING_ITEMS: _suggest_from_collecting_items,
+    ConversationState.CONFIRMING_ITEMS: _suggest_from_confirming_items,
+    ConversationState.RESOLVING_PENDING: _suggest_from_resolving_pending,
+    ConversationState.COLLECTING_DELIVERY_TYPE: _suggest_from_delivery_type,
+    ConversationState.COLLECTING_ADDRESS: _suggest_from_collecting_address,
+    ConversationState.CONFIRMING_ADDRESS: _suggest_from_confirming_address,
+    ConversationState.COLLECTING_PAYMENT: _suggest_from_collecting_payment,
+    ConversationState.COLLECTING_PAYMENT_DETAILS: _suggest_from_payment_details,
+    ConversationState.AWAITING_PIX_PROOF: _suggest_from_awaiting_pix,
+    ConversationState.CONFIRMING_ORDER: _suggest_from_confirming_order,
+}
+
+
+@dataclass(slots=True)
 class StateTransition:
     """Representa uma transição de estado."""
     from_state: ConversationState
@@ -238,7 +404,9 @@ class FSM:
     ):
         self.current_state = initial_state
         self.state_data = state_data or {}
-        self.transition_history: List[StateTransition] = []
+        # Deque limitado: append O(1) sem realloc e memória limitada em
+        # conversas longas (só as últimas transições interessam)
+        self.transition_history: deque[StateTransition] = deque(maxlen=64)
     
     @property
     def requirements(self) -> StateRequirements:
@@ -246,19 +414,19 @@ class FSM:
         return STATE_MACHINE[self.current_state]
     
     @property
-    def allowed_transitions(self) -> List[ConversationState]:
+    def allowed_transitions(self) -> tuple[ConversationState, ...]:
         """Estados para os quais pode transicionar."""
         return self.requirements.allowed_transitions
     
     @property
     def is_terminal(self) -> bool:
-        """Verifica se está em estado terminal."""
-        return self.requirements.is_terminal
-    
+        """Verifica se está em estado terminal (membership O(1))."""
+        return self.current_state in _TERMINAL_STATES
+
     @property
     def can_receive_items(self) -> bool:
-        """Verifica se o estado atual aceita itens do pedido."""
-        return self.requirements.can_receive_items
+        """Verifica se o estado atual aceita itens do pedido (membership O(1))."""
+        return self.current_state in _CAN_RECEIVE_ITEMS
     
     @property
     def agent_hint(self) -> str:
@@ -266,8 +434,8 @@ class FSM:
         return self.requirements.agent_hint
     
     def can_transition_to(self, target: ConversationState) -> bool:
-        """Verifica se a transição é permitida."""
-        return target in self.allowed_transitions
+        """Verifica se a transição é permitida (O(1) via frozenset)."""
+        return target in _ALLOWED_SETS[self.current_state]
     
     def transition(
         self,
@@ -287,12 +455,15 @@ class FSM:
             True se a transição foi bem-sucedida
         """
         if not self.can_transition_to(to_state):
-            logger.warning(
-                "fsm_invalid_transition",
-                from_state=self.current_state.value,
-                to_state=to_state.value,
-                allowed=self.allowed_transitions,
-            )
+            # Payload (inclui lookup de allowed_transitions) só é montado
+            # se o nível WARNING estiver habilitado
+            if _std_logger.isEnabledFor(logging.WARNING):
+                logger.warning(
+                    "fsm_invalid_transition",
+                    from_state=self.current_state.value,
+                    to_state=to_state.value,
+                    allowed=self.allowed_transitions,
+                )
             return False
         
         # Registra transição
@@ -312,13 +483,14 @@ class FSM:
         if data:
             self.state_data.update(data)
         
-        logger.info(
-            "fsm_transition",
-            from_state=old_state.value,
-            to_state=to_state.value,
-            reason=reason,
-        )
-        
+        if _std_logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "fsm_transition",
+                from_state=old_state.value,
+                to_state=to_state.value,
+                reason=reason,
+            )
+
         return True
     
     def force_transition(
@@ -336,15 +508,21 @@ class FSM:
         self.current_state = to_state
     
     def get_context_for_prompt(self) -> Dict[str, Any]:
-        """Retorna contexto do FSM para incluir no prompt."""
-        return {
-            "estado_atual": self.current_state.value,
-            "estados_permitidos": [s.value for s in self.allowed_transitions],
-            "hint": self.agent_hint,
-            "pode_receber_itens": self.can_receive_items,
-            "eh_terminal": self.is_terminal,
-            "dados_estado": self.state_data,
-        }
+        """Retorna contexto do FSM para incluir no prompt.
+
+        A parte estática vem pré-computada de _PROMPT_CONTEXT_BASE;
+        só o state_data varia por sessão.
+        """
+        return {**_PROMPT_CONTEXT_BASE[self.current_state], "dados_estado": self.state_data}
+
+    def get_context_for_prompt_json(self) -> bytes:
+        """Contexto do FSM já serializado em JSON (bytes).
+
+        A parte estática vem pré-serializada de _PROMPT_JSON_BASE; só o
+        state_data passa pelo orjson a cada chamada. Preferir esta versão
+        nos builders de prompt que vão direto para o LLM.
+        """
+        return _PROMPT_JSON_BASE[self.current_state] + orjson.dumps(self.state_data) + b"}"
     
     def suggest_next_state(
         self,
@@ -361,93 +539,46 @@ class FSM:
     ) -> Optional[ConversationState]:
         """
         Sugere o próximo estado baseado no contexto.
-        
+
         Útil para auto-transição quando o agente não especifica.
+        Despacho via _SUGGEST_HANDLERS: um lookup + uma chamada,
+        sem a escada de comparações por estado.
         """
-        current = self.current_state
-        
-        # GREETING → COLLECTING_ITEMS (quando começou a pedir)
-        if current == ConversationState.GREETING and cart_has_items:
-            return ConversationState.COLLECTING_ITEMS
-        
-        # COLLECTING_ITEMS → próximo estado
-        if current == ConversationState.COLLECTING_ITEMS:
-            if cart_has_pendencies:
-                return ConversationState.RESOLVING_PENDING
-            if items_confirmed:
-                return ConversationState.COLLECTING_DELIVERY_TYPE
-        
-        # CONFIRMING_ITEMS → próximo
-        if current == ConversationState.CONFIRMING_ITEMS:
-            if items_confirmed:
-                return ConversationState.COLLECTING_DELIVERY_TYPE
-        
-        # RESOLVING_PENDING → volta para items
-        if current == ConversationState.RESOLVING_PENDING:
-            if not cart_has_pendencies:
-                if cart_has_items:
-                    return ConversationState.CONFIRMING_ITEMS
-                return ConversationState.COLLECTING_ITEMS
-        
-        # COLLECTING_DELIVERY_TYPE → próximo
-        if current == ConversationState.COLLECTING_DELIVERY_TYPE:
-            if delivery_type == "pickup":
-                return ConversationState.COLLECTING_PAYMENT
-            if delivery_type == "delivery":
-                return ConversationState.COLLECTING_ADDRESS
-        
-        # COLLECTING_ADDRESS → confirmar
-        if current == ConversationState.COLLECTING_ADDRESS and address_provided:
-            return ConversationState.CONFIRMING_ADDRESS
-        
-        # CONFIRMING_ADDRESS → pagamento
-        if current == ConversationState.CONFIRMING_ADDRESS and address_confirmed:
-            return ConversationState.COLLECTING_PAYMENT
-        
-        # COLLECTING_PAYMENT → detalhes ou confirmar
-        if current == ConversationState.COLLECTING_PAYMENT and payment_method:
-            # PIX sempre precisa de comprovante
-            if payment_method == "pix":
-                return ConversationState.COLLECTING_PAYMENT_DETAILS
-            # Dinheiro precisa perguntar troco
-            if payment_method == "dinheiro":
-                return ConversationState.COLLECTING_PAYMENT_DETAILS
-            # Cartão vai direto para confirmar
-            return ConversationState.CONFIRMING_ORDER
-        
-        # COLLECTING_PAYMENT_DETAILS → próximo
-        if current == ConversationState.COLLECTING_PAYMENT_DETAILS:
-            if payment_method == "pix":
-                return ConversationState.AWAITING_PIX_PROOF
-            if payment_details_complete:
-                return ConversationState.CONFIRMING_ORDER
-        
-        # AWAITING_PIX_PROOF → confirmar
-        if current == ConversationState.AWAITING_PIX_PROOF and pix_proof_validated:
-            return ConversationState.CONFIRMING_ORDER
-        
-        # CONFIRMING_ORDER → enviado
-        if current == ConversationState.CONFIRMING_ORDER and order_confirmed:
-            return ConversationState.ORDER_SENT
-        
-        return None
+        handler = _SUGGEST_HANDLERS.get(self.current_state)
+        if handler is None:
+            return None
+        return handler(
+            cart_has_items=cart_has_items,
+            cart_has_pendencies=cart_has_pendencies,
+            items_confirmed=items_confirmed,
+            delivery_type=delivery_type,
+            address_provided=address_provided,
+            address_confirmed=address_confirmed,
+            payment_method=payment_method,
+            payment_details_complete=payment_details_complete,
+            pix_proof_validated=pix_proof_validated,
+            order_confirmed=order_confirmed,
+        )
+
+
+# Nomes amigáveis por estado (construído uma vez no import)
+_DISPLAY_NAMES: Dict[ConversationState, str] = {
+    ConversationState.GREETING: "Saudação",
+    ConversationState.COLLECTING_ITEMS: "Coletando Itens",
+    ConversationState.CONFIRMING_ITEMS: "Confirmando Itens",
+    ConversationState.RESOLVING_PENDING: "Resolvendo Pendências",
+    ConversationState.COLLECTING_DELIVERY_TYPE: "Tipo de Entrega",
+    ConversationState.COLLECTING_ADDRESS: "Coletando Endereço",
+    ConversationState.CONFIRMING_ADDRESS: "Confirmando Endereço",
+    ConversationState.COLLECTING_PAYMENT: "Forma de Pagamento",
+    ConversationState.COLLECTING_PAYMENT_DETAILS: "Detalhes Pagamento",
+    ConversationState.AWAITING_PIX_PROOF: "Aguardando PIX",
+    ConversationState.CONFIRMING_ORDER: "Confirmação Final",
+    ConversationState.ORDER_SENT: "Pedido Enviado",
+    ConversationState.CANCELLED: "Cancelado",
+}
 
 
 def get_state_display_name(state: ConversationState) -> str:
     """Retorna nome amigável do estado para logs/debug."""
-    names = {
-        ConversationState.GREETING: "Saudação",
-        ConversationState.COLLECTING_ITEMS: "Coletando Itens",
-        ConversationState.CONFIRMING_ITEMS: "Confirmando Itens",
-        ConversationState.RESOLVING_PENDING: "Resolvendo Pendências",
-        ConversationState.COLLECTING_DELIVERY_TYPE: "Tipo de Entrega",
-        ConversationState.COLLECTING_ADDRESS: "Coletando Endereço",
-        ConversationState.CONFIRMING_ADDRESS: "Confirmando Endereço",
-        ConversationState.COLLECTING_PAYMENT: "Forma de Pagamento",
-        ConversationState.COLLECTING_PAYMENT_DETAILS: "Detalhes Pagamento",
-        ConversationState.AWAITING_PIX_PROOF: "Aguardando PIX",
-        ConversationState.CONFIRMING_ORDER: "Confirmação Final",
-        ConversationState.ORDER_SENT: "Pedido Enviado",
-        ConversationState.CANCELLED: "Cancelado",
-    }
-    return names.get(state, state.value)
+    return _DISPLAY_NAMES.get(state, state.value)
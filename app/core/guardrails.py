@@ -13,9 +13,140 @@ from __future__ import annotations
 
 import re
 from enum import Enum
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
-from unidecode import unidecode
+# Engine opcional para os patterns de classificação: google-re2 compila
+# para DFA e casa em O(n) em C, sem backtracking por alternativa. A API
+# é compatível com `re`; sem o pacote instalado, cai no stdlib. O `re`
+# stdlib continua em uso para escape/sub fora do hot path.
+try:
+    import re2 as _regex  # type: ignore[import-not-found]
+    _CLASSIFY_FLAGS = re.IGNORECASE
+except ImportError:
+    _regex = re
+    # O texto normalizado é ASCII: restringir \d/\w/\s/\b (e o fold de
+    # caixa) ao ASCII evita o caminho Unicode do matcher do CPython.
+    # Emojis nos patterns seguem casando — são literais, não classes.
+    _CLASSIFY_FLAGS = re.IGNORECASE | re.ASCII
+
+# Tabela de transliteração dos acentos do português: uma passada de
+# str.translate em C substitui o dispatch por codepoint do unidecode,
+# que dominava o custo de normalize() em mensagens curtas
+_ACCENT_TABLE = str.maketrans(
+    "áàâãäéêíóôõúüçÁÀÂÃÄÉÊÍÓÔÕÚÜÇ",
+    "aaaaaeeiooouucAAAAAEEIOOOUUC",
+)
+_WS_RE = re.compile(r"\s+")
+# Telefone: forma tolerante (só dígitos e pontuação de telefone) + a
+# classificação fina por contagem de dígitos em _looks_like_phone
+_PHONE_SHAPE_RE = re.compile(r"^[+\s\d().-]+$")
+_DIGITS_RE = re.compile(r"\D")
+
+
+def _split_alternation(body: str) -> List[str]:
+    """Divide um corpo de regex nas alternâncias de nível superior."""
+    parts: List[str] = []
+    buf: List[str] = []
+    depth = 0
+    in_class = False
+    for ch in body:
+        if in_class:
+            buf.append(ch)
+            if ch == "]":
+                in_class = False
+            continue
+        if ch == "[":
+            in_class = True
+            buf.append(ch)
+            continue
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        if ch == "|" and depth == 0:
+            parts.append("".join(buf))
+            buf = []
+        else:
+            buf.append(ch)
+    parts.append("".join(buf))
+    return parts
+
+
+def _strip_outer_group(body: str) -> str:
+    """Remove parênteses que envolvem o corpo inteiro, se houver."""
+    if not (body.startswith("(") and body.endswith(")")):
+        return body
+    depth = 0
+    for i, ch in enumerate(body):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0 and i < len(body) - 1:
+                return body  # fecha antes do fim: não envolve tudo
+    return body[1:-1]
+
+
+def _split_literal_branches(pattern: str) -> Tuple[List[str], List[str]]:
+    """
+    Separa um pattern ancorado em alternativas puramente literais e as
+    restantes (quantificadores, classes de caracteres).
+
+    Retorna (literais, branches residuais).
+    """
+    body = pattern
+    if body.startswith("^"):
+        body = body[1:]
+    if body.endswith("$"):
+        body = body[:-1]
+    body = _strip_outer_group(body)
+
+    literals: List[str] = []
+    leftovers: List[str] = []
+    for branch in _split_alternation(body):
+        # Branch é literal se escapá-lo não muda nada (sem metacaracteres);
+        # re.escape escapa espaços, então normaliza isso antes de comparar
+        # para não rebaixar literais multi-palavra a residual
+        if branch and re.escape(branch).replace("\\ ", " ") == branch:
+            literals.append(branch)
+        else:
+            leftovers.append(branch)
+
+    return literals, leftovers
+
+
+def _branch_first_chars(branch: str) -> set:
+    """
+    Enumera os primeiros caracteres possíveis de um branch de regex.
+
+    Cobre as formas usadas nos patterns deste módulo: literal, escape,
+    grupo de alternativas e classe de caracteres sem ranges.
+    """
+    if not branch:
+        return set()
+    ch = branch[0]
+    if ch == "\\":
+        return {branch[1]}
+    if ch == "(":
+        depth = 0
+        for i, c in enumerate(branch):
+            if c == "(":
+                depth += 1
+            elif c == ")":
+                depth -= 1
+                if depth == 0:
+                    inner = branch[1:i]
+                    if inner.startswith("?:"):
+                        inner = inner[2:]
+                    return set().union(
+                        *(_branch_first_chars(b) for b in _split_alternation(inner))
+                    )
+        return set()
+    if ch == "[":
+        end = branch.index("]")
+        return {c for c in branch[1:end] if c not in "^\\"}
+    return {ch}
 
 
 class QuickIntent(str, Enum):
@@ -48,7 +179,17 @@ class QuickIntent(str, Enum):
 
 class InputGuardrails:
     """Classificador rápido de mensagens."""
-    
+
+    # Slots: instância sem __dict__ e acesso a atributo mais direto no
+    # hot path (os patterns de classe seguem no namespace da classe)
+    __slots__ = (
+        "_literal_map",
+        "_dispatch",
+        "_quantity_re",
+        "_address_combined",
+        "_classify_cached",
+    )
+
     # ==========================================
     # Patterns de Confirmação
     # ==========================================
@@ -138,15 +279,6 @@ class InputGuardrails:
     # ==========================================
     QUANTITY_PATTERN = r"^(\d{1,2})$"  # 1-99
     
-    # ==========================================
-    # Patterns de Telefone BR
-    # ==========================================
-    PHONE_PATTERNS = [
-        r"^\+?55?\s*\(?(\d{2})\)?\s*9?\s*(\d{4})[-.\s]?(\d{4})$",  # +55 47 99999-9999
-        r"^(\d{2})\s*9?(\d{4})[-.\s]?(\d{4})$",                     # 47 99999-9999
-        r"^9?(\d{4})[-.\s]?(\d{4})$",                               # 99999-9999
-    ]
-    
     # ==========================================
     # Patterns de Endereço (heurísticas)
     # ==========================================
@@ -165,40 +297,89 @@ class InputGuardrails:
     ]
     
     def __init__(self):
-        # Compila patterns para performance
-        self._confirm_re = self._compile_patterns(self.CONFIRM_PATTERNS)
-        self._deny_re = self._compile_patterns(self.DENY_PATTERNS)
-        self._cancel_re = self._compile_patterns(self.CANCEL_PATTERNS)
-        self._help_re = self._compile_patterns(self.HELP_PATTERNS)
-        self._repeat_re = self._compile_patterns(self.REPEAT_PATTERNS)
-        self._quantity_re = re.compile(self.QUANTITY_PATTERN, re.IGNORECASE)
-        self._phone_re = [re.compile(p, re.IGNORECASE) for p in self.PHONE_PATTERNS]
-        self._address_re = [re.compile(p, re.IGNORECASE) for p in self.ADDRESS_INDICATORS]
-        
-        # Payment patterns
-        self._payment_re = {
-            method: self._compile_patterns(patterns)
-            for method, patterns in self.PAYMENT_PATTERNS.items()
-        }
+        # Vocabulário literal: como os patterns de intenção são ancorados
+        # (^...$), cada alternativa puramente literal equivale a igualdade
+        # exata da string normalizada — um lookup O(1) em dict substitui
+        # 6+ passadas do motor de regex no caminho dominante.
+        self._literal_map: Dict[str, Tuple[QuickIntent, Optional[str]]] = {}
+
+        # Dispatch por primeiro caractere normalizado: cada residual só é
+        # tentado se o input começa com um caractere que ele pode casar —
+        # o prefix-dispatch que um DFA faria, em Python
+        self._dispatch: Dict[str, List[Tuple[re.Pattern, QuickIntent, Optional[str]]]] = {}
+
+        # Compila apenas o residual (alternativas com quantificadores etc.)
+        self._compile_residual(self.CONFIRM_PATTERNS, QuickIntent.CONFIRM)
+        self._compile_residual(self.DENY_PATTERNS, QuickIntent.DENY)
+        self._compile_residual(self.CANCEL_PATTERNS, QuickIntent.CANCEL)
+        self._compile_residual(self.HELP_PATTERNS, QuickIntent.HELP)
+        self._compile_residual(self.REPEAT_PATTERNS, QuickIntent.REPEAT)
+        self._quantity_re = _regex.compile(self.QUANTITY_PATTERN, _CLASSIFY_FLAGS)
+        # Indicadores de endereço numa única alternância: 1 findall no
+        # lugar de 11 searches sobre a mesma string
+        self._address_combined = _regex.compile(
+            "|".join(f"(?:{p})" for p in self.ADDRESS_INDICATORS),
+            _CLASSIFY_FLAGS,
+        )
+
+        # Payment patterns (residual; literais vão para o _literal_map)
+        for method, patterns in self.PAYMENT_PATTERNS.items():
+            self._compile_residual(
+                patterns, QuickIntent.PAYMENT_METHOD, payment_method=method
+            )
+
+        # Cache do caminho sem contexto, construído por instância: um
+        # lru_cache direto no método (ruff B019) guardaria `self` num
+        # cache de escopo de classe; aqui o cache vive e morre junto com
+        # a instância (na prática, o singleton do módulo)
+        self._classify_cached = lru_cache(maxsize=4096)(self._classify_uncached)
+
+    def _compile_residual(
+        self,
+        patterns: List[str],
+        intent: QuickIntent,
+        payment_method: Optional[str] = None,
+    ) -> None:
+        """
+        Registra as alternativas literais de `patterns` no _literal_map
+        e compila só o que sobrou, registrado no dispatch sob cada
+        primeiro caractere que os branches residuais podem casar.
+        """
+        residual: List[str] = []
+        first_chars: set = set()
+        for pattern in patterns:
+            literals, leftovers = _split_literal_branches(pattern)
+            for literal in literals:
+                # Registra a forma normalizada e a forma acentuada crua:
+                # a segunda permite o lookup direto sem nem normalizar
+                key = self.normalize(literal)
+                if key and key not in self._literal_map:
+                    self._literal_map[key] = (intent, payment_method)
+                if literal != key and literal not in self._literal_map:
+                    self._literal_map[literal] = (intent, payment_method)
+            for branch in leftovers:
+                residual.append(branch)
+                first_chars |= _branch_first_chars(branch)
+        if not residual:
+            return
+        compiled = self._compile_patterns([f"^({'|'.join(residual)})$"])
+        entry = (compiled, intent, payment_method)
+        for ch in first_chars:
+            # Chave no espaço normalizado (sem acentos, minúscula)
+            self._dispatch.setdefault(
+                ch.translate(_ACCENT_TABLE).lower(), []
+            ).append(entry)
     
     @staticmethod
     def _compile_patterns(patterns: List[str]) -> re.Pattern:
         """Compila lista de patterns em um único regex."""
         combined = "|".join(f"({p})" for p in patterns)
-        return re.compile(combined, re.IGNORECASE | re.UNICODE)
+        return _regex.compile(combined, _CLASSIFY_FLAGS)
     
     @staticmethod
     def normalize(text: str) -> str:
-        """Normaliza texto para comparação."""
-        # Remove acentos
-        text = unidecode(text)
-        # Lowercase
-        text = text.lower()
-        # Remove espaços extras
-        text = " ".join(text.split())
-        # Remove pontuação no início/fim
-        text = text.strip(".,!?;:\"'")
-        return text
+        """Normaliza texto para comparação (acentos, caixa, espaços)."""
+        return _WS_RE.sub(" ", text.translate(_ACCENT_TABLE).lower()).strip(" .,!?;:\"'")
     
     def classify(
         self,
@@ -207,97 +388,126 @@ class InputGuardrails:
     ) -> Tuple[QuickIntent, Dict[str, Any]]:
         """
         Classifica uma mensagem.
-        
+
         Args:
             text: Mensagem do usuário
             context: Contexto opcional (estado atual, etc)
-            
+
         Returns:
             Tuple de (intenção detectada, dados extraídos)
         """
+        # Fast path: o tráfego dominante é um punhado de tokens repetidos
+        # ("sim", "ok", "2"...) — com contexto ausente o resultado é função
+        # só do texto e vem memoizado do LRU
+        if context is None:
+            intent, items = self._classify_cached(text)
+            return intent, dict(items)
+        intent, items = self._classify_uncached(text)
+        return intent, dict(items)
+
+    def _classify_uncached(
+        self,
+        text: str,
+    ) -> Tuple[QuickIntent, Tuple[Tuple[str, Any], ...]]:
+        """Classificação propriamente dita; retorna extraídos como tupla
+        hasheável para poder viver no LRU."""
+        # Lookup direto antes de normalizar: o _literal_map também guarda
+        # as formas acentuadas cruas, então "não"/"cardápio" digitados
+        # limpos resolvem sem pagar translate/strip
+        hit = self._literal_map.get(text) or self._literal_map.get(text.lower())
+        if hit is not None:
+            intent, payment_method = hit
+            if payment_method is not None:
+                return intent, (("payment_method", payment_method),)
+            return intent, ()
+
         # Normaliza
         normalized = self.normalize(text)
         original = text.strip()
-        
-        # Dict para dados extraídos
-        extracted: Dict[str, Any] = {}
-        
+
         # Mensagem vazia
         if not normalized:
-            return QuickIntent.NEEDS_LLM, extracted
-        
-        # ==========================================
-        # Confirmação
-        # ==========================================
-        if self._confirm_re.match(normalized):
-            return QuickIntent.CONFIRM, extracted
-        
-        # ==========================================
-        # Negação
-        # ==========================================
-        if self._deny_re.match(normalized):
-            return QuickIntent.DENY, extracted
-        
-        # ==========================================
-        # Cancelamento
-        # ==========================================
-        if self._cancel_re.match(normalized):
-            return QuickIntent.CANCEL, extracted
-        
+            return QuickIntent.NEEDS_LLM, ()
+
         # ==========================================
-        # Ajuda / Menu
+        # Vocabulário literal (caminho dominante, O(1))
         # ==========================================
-        if self._help_re.match(normalized):
-            return QuickIntent.HELP, extracted
-        
+        hit = self._literal_map.get(normalized)
+        if hit is not None:
+            intent, payment_method = hit
+            if payment_method is not None:
+                return intent, (("payment_method", payment_method),)
+            return intent, ()
+
         # ==========================================
-        # Repetição
+        # Pré-classificação por forma da mensagem
         # ==========================================
-        if self._repeat_re.match(normalized):
-            return QuickIntent.REPEAT, extracted
-        
+        # Só dígitos: é quantidade ou telefone — os megapatterns de
+        # resposta curta nunca casariam, não há por que rodá-los
+        if normalized.isdigit():
+            qty_match = self._quantity_re.match(normalized)
+            if qty_match:
+                return QuickIntent.QUANTITY, (("quantity", int(qty_match.group(1))),)
+            return self._classify_phone_or_address(normalized, original)
+
         # ==========================================
-        # Forma de pagamento
+        # Residuais, filtrados pelo primeiro caractere
         # ==========================================
-        for method, pattern in self._payment_re.items():
+        # Sem corte por comprimento: os residuais têm quantificadores sem
+        # limite ("naoo*", "okk+", 👍 repetido), então uma resposta curta
+        # esticada pode ser arbitrariamente longa. O dispatch por primeiro
+        # caractere já descarta barato o que não pode casar
+        # A ordem de prioridade (confirmação → negação → cancelamento →
+        # ajuda → repetição → pagamento) é a ordem de inserção no bucket
+        for pattern, intent, payment_method in self._dispatch.get(normalized[0], ()):
             if pattern.match(normalized):
-                extracted["payment_method"] = method
-                return QuickIntent.PAYMENT_METHOD, extracted
-        
-        # ==========================================
-        # Quantidade (apenas número)
-        # ==========================================
-        qty_match = self._quantity_re.match(normalized)
-        if qty_match:
-            extracted["quantity"] = int(qty_match.group(1))
-            return QuickIntent.QUANTITY, extracted
-        
+                if payment_method is not None:
+                    return intent, (("payment_method", payment_method),)
+                return intent, ()
+
+        return self._classify_phone_or_address(normalized, original)
+
+    def _classify_phone_or_address(
+        self,
+        normalized: str,
+        original: str,
+    ) -> Tuple[QuickIntent, Tuple[Tuple[str, Any], ...]]:
+        """Cauda da classificação: dados estruturados ou LLM."""
         # ==========================================
         # Telefone
         # ==========================================
-        for phone_re in self._phone_re:
-            if phone_re.match(original):
-                # Extrai apenas dígitos
-                digits = re.sub(r"\D", "", original)
-                extracted["phone"] = self._normalize_phone(digits)
-                return QuickIntent.PHONE_NUMBER, extracted
-        
+        # Em vez de 3 regexes com grupos opcionais sobrepostos: checa a
+        # forma (só dígitos e pontuação de telefone) e classifica pela
+        # contagem de dígitos
+        if _PHONE_SHAPE_RE.match(original):
+            digits = _DIGITS_RE.sub("", original)
+            if self._looks_like_phone(digits):
+                return QuickIntent.PHONE_NUMBER, (("phone", self._normalize_phone(digits)),)
+
         # ==========================================
         # Endereço (heurística - presença de indicadores)
         # ==========================================
-        address_score = sum(
-            1 for pattern in self._address_re
-            if pattern.search(normalized)
-        )
+        address_score = len(self._address_combined.findall(normalized))
         if address_score >= 2:  # Pelo menos 2 indicadores
-            extracted["possible_address"] = original
-            return QuickIntent.ADDRESS, extracted
-        
+            return QuickIntent.ADDRESS, (("possible_address", original),)
+
         # ==========================================
         # Não conseguiu classificar → LLM
         # ==========================================
-        return QuickIntent.NEEDS_LLM, extracted
+        return QuickIntent.NEEDS_LLM, ()
     
+    @staticmethod
+    def _looks_like_phone(digits: str) -> bool:
+        """Classifica telefone BR pela contagem de dígitos."""
+        n = len(digits)
+        if n == 8 or n == 10 or n == 11:      # fixo / DDD+fixo / DDD+móvel
+            return True
+        if n == 9:                            # móvel sem DDD começa com 9
+            return digits[0] == "9"
+        if n in (12, 13):                     # com código do país
+            return digits.startswith("55")
+        return False
+
     @staticmethod
     def _normalize_phone(digits: str) -> str:
         """Normaliza telefone para formato padrão."""
@@ -345,15 +555,20 @@ class InputGuardrails:
 # Singleton para uso global
 guardrails = InputGuardrails()
 
+# Métodos bound hoisted para o módulo: cada chamada economiza o lookup
+# singleton -> atributo -> descriptor
+_classify = guardrails.classify
+_is_simple = guardrails.is_simple_response
+
 
 def classify_input(
     text: str,
     context: Optional[Dict[str, Any]] = None,
 ) -> Tuple[QuickIntent, Dict[str, Any]]:
     """Função de conveniência para classificar input."""
-    return guardrails.classify(text, context)
+    return _classify(text, context)
 
 
 def is_simple_input(text: str) -> bool:
     """Verifica se input é simples (não precisa LLM)."""
-    return guardrails.is_simple_response(text)
+    return _is_simple(text)
@@ -13,7 +13,15 @@ from decimal import Decimal
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import (
+    BaseModel,
+    Field,
+    PrivateAttr,
+    TypeAdapter,
+    computed_field,
+    field_validator,
+    model_validator,
+)
 
 
 # ============================================
@@ -56,15 +64,25 @@ class ModificationAction(str, Enum):
 
 class CartItemAddition(BaseModel):
     """Um adicional vinculado a um item do carrinho."""
-    
+
     pdv: str = Field(..., description="Código PDV do adicional")
     nome: str = Field(..., description="Nome do adicional")
     quantidade: int = Field(default=1, ge=1, le=10)
     preco_unitario: Decimal = Field(..., ge=0)
-    
+
+    # Preço em centavos: reais têm sempre 2 casas, então a aritmética de
+    # totais pode rodar em int (ordens de grandeza mais barata que
+    # Decimal) e converter para Decimal só no resultado
+    _cents: int = PrivateAttr(default=0)
+
+    @model_validator(mode="after")
+    def _cache_cents(self) -> "CartItemAddition":
+        self._cents = int((self.preco_unitario * 100).to_integral_value())
+        return self
+
     @property
     def preco_total(self) -> Decimal:
-        return self.preco_unitario * self.quantidade
+        return Decimal(self._cents * self.quantidade).scaleb(-2)
 
 
 class CartItem(BaseModel):
@@ -78,26 +96,34 @@ class CartItem(BaseModel):
     adicionais: List[CartItemAddition] = Field(default_factory=list)
     observacoes: str = Field(default="", max_length=500)
     
-    # Campos calculados (preenchidos automaticamente)
-    preco_total_unitario: Optional[Decimal] = None  # Preço com adicionais (1 unidade)
-    preco_total: Optional[Decimal] = None           # Preço total (quantidade * unitário)
-    
+    _cents: int = PrivateAttr(default=0)
+    _unit_cents: int = PrivateAttr(default=0)
+    _group_key: Optional[tuple] = PrivateAttr(default=None)
+
     @model_validator(mode="after")
-    def calculate_totals(self) -> "CartItem":
-        """Calcula os preços totais automaticamente."""
-        # Soma dos adicionais
-        adicionais_total = sum(
-            a.preco_unitario * a.quantidade 
-            for a in self.adicionais
+    def _cache_cents(self) -> "CartItem":
+        """Cacheia os preços em centavos (aritmética int, não Decimal)."""
+        self._cents = int((self.preco_unitario * 100).to_integral_value())
+        # Preço unitário com adicionais, em centavos
+        self._unit_cents = self._cents + sum(
+            a._cents * a.quantidade for a in self.adicionais
         )
-        
-        # Preço unitário com adicionais
-        self.preco_total_unitario = self.preco_unitario + adicionais_total
-        
-        # Preço total considerando quantidade
-        self.preco_total = self.preco_total_unitario * self.quantidade
-        
         return self
+
+    # Totais derivados em vez de campos mutáveis: nunca ficam stale
+    # quando quantidade muda, e continuam no model_dump por serem
+    # computed_field
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def preco_total_unitario(self) -> Decimal:
+        """Preço com adicionais (1 unidade)."""
+        return Decimal(self._unit_cents).scaleb(-2)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def preco_total(self) -> Decimal:
+        """Preço total (quantidade * unitário)."""
+        return Decimal(self._unit_cents * self.quantidade).scaleb(-2)
     
     @field_validator("quantidade", mode="before")
     @classmethod
@@ -122,6 +148,19 @@ class CartItem(BaseModel):
             return int(v)
         return v
 
+    @property
+    def grouping_key(self) -> tuple:
+        """Chave estável de agrupamento (pdv, observações, adicionais)."""
+        key = self._group_key
+        if key is None:
+            key = (
+                self.pdv,
+                self.observacoes,
+                frozenset((a.pdv, a.quantidade) for a in self.adicionais),
+            )
+            self._group_key = key
+        return key
+
 
 class CartPendency(BaseModel):
     """Uma pendência que precisa ser resolvida antes de continuar."""
@@ -137,16 +176,36 @@ class CartState(BaseModel):
     
     itens: List[CartItem] = Field(default_factory=list)
     pendencias: List[CartPendency] = Field(default_factory=list)
-    
+
+    # Totais mantidos incrementalmente pelas mutações: o agente exibe e
+    # persiste o carrinho várias vezes por turno, e cada acesso seria
+    # uma soma O(n) sobre os itens
+    _subtotal_cache: Decimal = PrivateAttr(default=Decimal(0))
+    _count_cache: int = PrivateAttr(default=0)
+    # Índice grouping_key -> item: detecção de duplicata em O(1) no
+    # add_item, em vez de varrer itens comparando sets de adicionais
+    _index: Dict[tuple, CartItem] = PrivateAttr(default_factory=dict)
+
+    @model_validator(mode="after")
+    def _rebuild_totals(self) -> "CartState":
+        """Recalcula caches e índice ao construir/desserializar o modelo."""
+        self._subtotal_cache = sum(
+            (item.preco_total for item in self.itens),
+            Decimal(0),
+        )
+        self._count_cache = sum(item.quantidade for item in self.itens)
+        self._index = {item.grouping_key: item for item in self.itens}
+        return self
+
     @property
     def subtotal(self) -> Decimal:
         """Soma dos preços de todos os itens."""
-        return sum(item.preco_total or Decimal(0) for item in self.itens)
-    
+        return self._subtotal_cache
+
     @property
     def total_itens(self) -> int:
         """Quantidade total de itens no carrinho."""
-        return sum(item.quantidade for item in self.itens)
+        return self._count_cache
     
     @property
     def tem_pendencias(self) -> bool:
@@ -160,38 +219,43 @@ class CartState(BaseModel):
     
     def add_item(self, item: CartItem) -> None:
         """Adiciona item ao carrinho (agrupa se já existir)."""
-        # Procura item existente com mesmo PDV e observações
-        for existing in self.itens:
-            if existing.pdv == item.pdv and existing.observacoes == item.observacoes:
-                # Verifica se adicionais são iguais
-                existing_adds = {(a.pdv, a.quantidade) for a in existing.adicionais}
-                new_adds = {(a.pdv, a.quantidade) for a in item.adicionais}
-                
-                if existing_adds == new_adds:
-                    existing.quantidade += item.quantidade
-                    # Recalcula totais
-                    existing.preco_total = existing.preco_total_unitario * existing.quantidade
-                    return
-        
-        # Item novo, adiciona à lista
+        existing = self._index.get(item.grouping_key)
+        if existing is not None:
+            # preco_total é derivado; basta ajustar quantidade e caches
+            existing.quantidade += item.quantidade
+            self._subtotal_cache += existing.preco_total_unitario * item.quantidade
+            self._count_cache += item.quantidade
+            return
+
+        # Item novo, adiciona à lista e ao índice
         self.itens.append(item)
-    
+        self._index[item.grouping_key] = item
+        self._subtotal_cache += item.preco_total
+        self._count_cache += item.quantidade
+
     def remove_item(self, pdv: str, quantidade: int = 1) -> bool:
         """Remove item do carrinho. Retorna True se removido."""
         for i, item in enumerate(self.itens):
             if item.pdv == pdv:
                 if item.quantidade <= quantidade:
                     self.itens.pop(i)
+                    self._index.pop(item.grouping_key, None)
+                    self._subtotal_cache -= item.preco_total
+                    self._count_cache -= item.quantidade
                 else:
                     item.quantidade -= quantidade
-                    item.preco_total = item.preco_total_unitario * item.quantidade
+                    self._subtotal_cache -= item.preco_total_unitario * quantidade
+                    self._count_cache -= quantidade
                 return True
         return False
-    
+
     def clear(self) -> None:
         """Limpa o carrinho."""
         self.itens = []
         self.pendencias = []
+        self._index = {}
+        self._subtotal_cache = Decimal(0)
+        self._count_cache = 0
     
     def add_pendency(self, pendency: CartPendency) -> None:
         """Adiciona pendência à lista."""
@@ -207,24 +271,34 @@ class CartState(BaseModel):
         """Gera resumo textual do carrinho para o cliente."""
         if self.is_empty:
             return "Seu carrinho está vazio."
-        
-        lines = ["📦 *Seu Pedido:*", ""]
-        
-        for item in self.itens:
-            line = f"• {item.quantidade}x {item.nome}"
-            if item.adicionais:
-                adds = ", ".join(f"+{a.nome}" for a in item.adicionais)
-                line += f" ({adds})"
-            line += f" — R$ {item.preco_total:.2f}"
-            lines.append(line)
-            
-            if item.observacoes:
-                lines.append(f"  _Obs: {item.observacoes}_")
-        
-        lines.append("")
-        lines.append(f"*Subtotal: R$ {self.subtotal:.2f}*")
-        
-        return "\n".join(lines)
+
+        # Preços formatados a partir dos centavos (int), sem passar pelo
+        # __format__ do Decimal; um único join monta o corpo
+        def _line(item: CartItem) -> str:
+            adds = (
+                f" ({', '.join('+' + a.nome for a in item.adicionais)})"
+                if item.adicionais
+                else ""
+            )
+            obs = f"\n  _Obs: {item.observacoes}_" if item.observacoes else ""
+            cents = item._unit_cents * item.quantidade
+            return (
+                f"• {item.quantidade}x {item.nome}{adds}"
+                f" — R$ {cents // 100}.{cents % 100:02d}{obs}"
+            )
+
+        body = "\n".join(_line(item) for item in self.itens)
+        subtotal = int((self._subtotal_cache * 100).to_integral_value())
+        return (
+            f"📦 *Seu Pedido:*\n\n{body}\n\n"
+            f"*Subtotal: R$ {subtotal // 100}.{subtotal % 100:02d}*"
+        )
+
+
+# Adapter de borda para listas de itens vindas do LLM: valida o lote
+# inteiro numa chamada só do pydantic-core, em vez de um CartItem(...)
+# por item no Python. Módulo-level para o schema compilar uma única vez.
+CART_ITEMS_ADAPTER: TypeAdapter[List[CartItem]] = TypeAdapter(List[CartItem])
 
 
 # ============================================
@@ -3,43 +3,132 @@ Conexão com o banco de dados Supabase.
 """
 from __future__ import annotations
 
+import asyncio
+import time
 from functools import lru_cache
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import httpx
 import structlog
 from supabase import Client, create_client
+from supabase.lib.client_options import ClientOptions
 
 from app.config import settings
+from app.utils.phone import normalize_phone
+from app.utils.text import make_fingerprint, normalize_text
 
 logger = structlog.get_logger()
 
+# Pool HTTP compartilhado: keep-alive evita novo handshake TCP/TLS a cada
+# query, e os limites impedem que um burst abra conexões sem teto
+_HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+_HTTP_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+
+_http_client: Optional[httpx.Client] = None
+
 
 @lru_cache
 def get_supabase_client() -> Client:
     """
     Retorna cliente Supabase singleton.
-    
-    Usa lru_cache para manter uma única instância.
+
+    Usa lru_cache para manter uma única instância, com pool de conexões
+    httpx configurado (keep-alive + timeouts).
     """
+    global _http_client
+
     logger.info(
         "supabase_connecting",
         url=settings.supabase_url[:50] + "...",
     )
-    
+
+    _http_client = httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    try:
+        options = ClientOptions(
+            postgrest_client_timeout=5,
+            httpx_client=_http_client,
+        )
+    except TypeError:
+        # Versões mais antigas do supabase-py não aceitam httpx_client;
+        # o singleton ainda garante uma sessão persistente por processo
+        _http_client.close()
+        _http_client = None
+        options = ClientOptions(postgrest_client_timeout=5)
+
     client = create_client(
         supabase_url=settings.supabase_url,
         supabase_key=settings.supabase_key,
+        options=options,
     )
-    
+
     logger.info("supabase_connected")
     return client
 
 
+def close_supabase_client() -> None:
+    """Fecha o pool HTTP e descarta o singleton (usado no shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+    get_supabase_client.cache_clear()
+
+
 def get_db() -> Client:
     """Alias para get_supabase_client()."""
     return get_supabase_client()
 
 
+# ==========================================
+# Cache TTL para leituras quase estáticas
+# ==========================================
+
+# Sentinela para distinguir "não cacheado" de "cacheado como None"
+_MISS = object()
+
+
+class _TTLCache:
+    """
+    Cache com expiração para dados que mudam raramente (tenants, taxas
+    de entrega, cardápio). Expiração é verificada na leitura; quando o
+    cache enche, descarta tudo — mais simples que LRU e suficiente para
+    o volume de chaves aqui.
+    """
+
+    __slots__ = ("_data", "_maxsize", "_ttl")
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0):
+        self._data: Dict[Tuple, Tuple[float, Any]] = {}
+        self._maxsize = maxsize
+        self._ttl = ttl
+
+    def get(self, key: Tuple) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISS
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._data.pop(key, None)
+            return _MISS
+        return value
+
+    def set(self, key: Tuple, value: Any) -> None:
+        if len(self._data) >= self._maxsize:
+            self._data.clear()
+        self._data[key] = (time.monotonic() + self._ttl, value)
+
+    def evict(self, predicate: Callable[[Tuple, Any], bool]) -> None:
+        stale = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+        for key in stale:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+_read_cache = _TTLCache(maxsize=256, ttl=300.0)
+
+
 class Database:
     """
     Wrapper para operações de banco de dados.
@@ -60,54 +149,73 @@ class Database:
     def table(self, name: str):
         """Acessa uma tabela."""
         return self.client.table(name)
-    
+
+    @staticmethod
+    async def _execute(query):
+        """Executa a query em thread — o SDK é síncrono e bloquearia o event loop."""
+        return await asyncio.to_thread(query.execute)
+
     # ==========================================
     # Métodos de conveniência
     # ==========================================
-    
+
     async def get_tenant_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
-        """Busca tenant pelo slug."""
-        result = (
+        """Busca tenant pelo slug (cacheado por 5 min)."""
+        key = ("tenant_slug", slug)
+        cached = _read_cache.get(key)
+        if cached is not _MISS:
+            return cached
+
+        result = await self._execute(
             self.table("tenants")
             .select("*")
             .eq("slug", slug)
             .eq("is_active", True)
-            .single()
-            .execute()
+            .limit(1)
+            .maybe_single()
         )
-        return result.data if result.data else None
-    
+        data = result.data if result and result.data else None
+        _read_cache.set(key, data)
+        return data
+
     async def get_tenant_by_evolution_instance(
         self,
         instance: str,
     ) -> Optional[Dict[str, Any]]:
-        """Busca tenant pela instância Evolution."""
-        result = (
+        """Busca tenant pela instância Evolution (cacheado por 5 min)."""
+        key = ("tenant_instance", instance)
+        cached = _read_cache.get(key)
+        if cached is not _MISS:
+            return cached
+
+        result = await self._execute(
             self.table("tenants")
             .select("*")
             .eq("evolution_instance", instance)
             .eq("is_active", True)
-            .single()
-            .execute()
+            .limit(1)
+            .maybe_single()
         )
-        return result.data if result.data else None
-    
+        data = result.data if result and result.data else None
+        _read_cache.set(key, data)
+        return data
+
     async def get_session(
         self,
         tenant_id: str,
         session_id: str,
     ) -> Optional[Dict[str, Any]]:
         """Busca sessão ativa."""
-        result = (
+        result = await self._execute(
             self.table("sessions")
             .select("*")
             .eq("tenant_id", tenant_id)
             .eq("session_id", session_id)
             .eq("status", "active")
-            .single()
-            .execute()
+            .limit(1)
+            .maybe_single()
         )
-        return result.data if result.data else None
+        return result.data if result and result.data else None
     
     async def upsert_session(
         self,
@@ -124,33 +232,48 @@ class Database:
             **data,
         }
         
-        result = (
+        result = await self._execute(
             self.table("sessions")
             .upsert(session_data, on_conflict="tenant_id,session_id,status")
-            .execute()
         )
-        
+
         return result.data[0] if result.data else session_data
     
+    async def get_webhook_context(
+        self,
+        instance: str,
+        phone: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Busca tenant + snapshot do cliente + sessão ativa em uma única
+        RPC (webhook_context, migration 003) — 1 round trip em vez de 3-4
+        na entrada do webhook. Retorna None se a instância não existir.
+        """
+        result = await self._execute(
+            self.client.rpc(
+                "webhook_context",
+                {"p_instance": instance, "p_phone": phone},
+            )
+        )
+        return result.data if result and result.data else None
+
     async def get_client_by_phone(
         self,
         tenant_id: str,
         phone: str,
     ) -> Optional[Dict[str, Any]]:
         """Busca cliente pelo telefone."""
-        # Normaliza telefone
-        from app.utils.phone import normalize_phone
         phone_normalized = normalize_phone(phone)
         
-        result = (
+        result = await self._execute(
             self.table("clients")
             .select("*")
             .eq("tenant_id", tenant_id)
             .eq("phone_normalized", phone_normalized)
-            .single()
-            .execute()
+            .limit(1)
+            .maybe_single()
         )
-        return result.data if result.data else None
+        return result.data if result and result.data else None
     
     async def get_client_snapshot(
         self,
@@ -158,18 +281,17 @@ class Database:
         phone: str,
     ) -> Optional[Dict[str, Any]]:
         """Busca snapshot completo do cliente via view."""
-        from app.utils.phone import normalize_phone
         phone_normalized = normalize_phone(phone)
         
-        result = (
+        result = await self._execute(
             self.table("v_client_snapshot")
             .select("*")
             .eq("tenant_id", tenant_id)
             .eq("phone_normalized", phone_normalized)
-            .single()
-            .execute()
+            .limit(1)
+            .maybe_single()
         )
-        return result.data if result.data else None
+        return result.data if result and result.data else None
     
     async def search_menu(
         self,
@@ -179,7 +301,12 @@ class Database:
         item_type: Optional[str] = None,
         limit: int = 50,
     ) -> List[Dict[str, Any]]:
-        """Busca itens no cardápio."""
+        """Busca itens no cardápio (cacheado por 5 min por combinação de filtros)."""
+        key = ("menu", tenant_id, query, category, item_type, limit)
+        cached = _read_cache.get(key)
+        if cached is not _MISS:
+            return cached
+
         q = (
             self.table("menu_items")
             .select("*")
@@ -195,30 +322,41 @@ class Database:
         
         if query:
             # Busca por fingerprint ou nome
-            from app.utils.text import make_fingerprint
             fingerprint = make_fingerprint(query)
             q = q.or_(f"fingerprint.ilike.%{fingerprint}%,name.ilike.%{query}%")
         
         q = q.limit(limit)
-        
-        result = q.execute()
-        return result.data or []
+
+        result = await self._execute(q)
+        data = result.data or []
+        _read_cache.set(key, data)
+        return data
     
-    async def get_menu_item_by_pdv(
+    async def get_menu_items_by_pdvs(
         self,
         tenant_id: str,
-        pdv_code: str,
-    ) -> Optional[Dict[str, Any]]:
-        """Busca item do cardápio pelo código PDV."""
-        result = (
+        pdv_codes: List[str],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Busca vários itens do cardápio numa única query, indexados por PDV."""
+        if not pdv_codes:
+            return {}
+
+        result = await self._execute(
             self.table("menu_items")
             .select("*")
             .eq("tenant_id", tenant_id)
-            .eq("pdv_code", pdv_code)
-            .single()
-            .execute()
+            .in_("pdv_code", list(pdv_codes))
         )
-        return result.data if result.data else None
+        return {row["pdv_code"]: row for row in (result.data or [])}
+
+    async def get_menu_item_by_pdv(
+        self,
+        tenant_id: str,
+        pdv_code: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Busca item do cardápio pelo código PDV."""
+        items = await self.get_menu_items_by_pdvs(tenant_id, [pdv_code])
+        return items.get(pdv_code)
     
     async def get_delivery_fee(
         self,
@@ -226,18 +364,41 @@ class Database:
         district: str,
         city: str = "Itajaí",
     ) -> Optional[Dict[str, Any]]:
-        """Busca taxa de entrega por bairro."""
-        result = (
+        """Busca taxa de entrega por bairro (cacheado por 5 min)."""
+        key = ("delivery_fee", tenant_id, district, city)
+        cached = _read_cache.get(key)
+        if cached is not _MISS:
+            return cached
+
+        # Lookup exato pela coluna normalizada (índice btree); o ILIKE
+        # fica como fallback para grafias parciais
+        result = await self._execute(
             self.table("delivery_areas")
             .select("*")
             .eq("tenant_id", tenant_id)
             .eq("city", city)
-            .ilike("district", f"%{district}%")
+            .eq("district_normalized", normalize_text(district))
             .eq("is_active", True)
-            .single()
-            .execute()
+            .limit(1)
+            .maybe_single()
         )
-        return result.data if result.data else None
+        data = result.data if result and result.data else None
+
+        if data is None:
+            result = await self._execute(
+                self.table("delivery_areas")
+                .select("*")
+                .eq("tenant_id", tenant_id)
+                .eq("city", city)
+                .ilike("district", f"%{district}%")
+                .eq("is_active", True)
+                .limit(1)
+                .maybe_single()
+            )
+            data = result.data if result and result.data else None
+
+        _read_cache.set(key, data)
+        return data
     
     async def add_message_to_history(
         self,
@@ -254,8 +415,12 @@ class Database:
             **kwargs,
         }
         
-        result = self.table("messages").insert(message_data).execute()
-        return result.data[0] if result.data else message_data
+        # returning="minimal": o caller não usa a linha devolvida, então o
+        # PostgREST não precisa serializar nem transferir a representação
+        result = await self._execute(
+            self.table("messages").insert(message_data, returning="minimal")
+        )
+        return result.data[0] if result and result.data else message_data
     
     async def get_message_history(
         self,
@@ -263,16 +428,38 @@ class Database:
         limit: int = 20,
     ) -> List[Dict[str, Any]]:
         """Busca histórico de mensagens da sessão."""
-        result = (
+        result = await self._execute(
             self.table("messages")
             .select("*")
             .eq("session_id", session_uuid)
             .order("created_at", desc=False)
             .limit(limit)
-            .execute()
         )
         return result.data or []
 
+    # ==========================================
+    # Invalidação de cache
+    # ==========================================
+
+    def invalidate_tenant(self, slug: str) -> None:
+        """
+        Descarta entradas cacheadas do tenant (chamar após alterar
+        cadastro, cardápio ou áreas de entrega no painel).
+        """
+        tenant = _read_cache.get(("tenant_slug", slug))
+        tenant_id = tenant.get("id") if tenant not in (_MISS, None) else None
+
+        def _stale(key: Tuple, value: Any) -> bool:
+            kind = key[0]
+            if kind == "tenant_slug":
+                return key[1] == slug
+            if kind == "tenant_instance":
+                return bool(value) and value.get("slug") == slug
+            # menu / delivery_fee têm tenant_id na posição 1
+            return tenant_id is not None and key[1] == tenant_id
+
+        _read_cache.evict(_stale)
+
 
 # Instância global
 db = Database()
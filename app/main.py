@@ -5,29 +5,42 @@ Este é o ponto de entrada da aplicação.
 """
 from __future__ import annotations
 
+import time
 from contextlib import asynccontextmanager
 from typing import Any, Dict
 
+import orjson
 import structlog
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
 from app.core.exceptions import LiaError
 
-# Configura logging estruturado
+
+def _orjson_dumps(obj: Any, **_: Any) -> str:
+    """Serializer do JSONRenderer via orjson (C) em vez do json stdlib."""
+    return orjson.dumps(obj).decode()
+
+
+# Configura logging estruturado.
+# A cadeia de processors roda sincronamente no event loop a cada evento,
+# então fica enxuta: sem PositionalArgumentsFormatter (todos os call sites
+# usam kwargs) e sem UnicodeDecoder (só há str em Python 3). format_exc_info
+# e StackInfoRenderer ficam — são no-op barato sem exc_info/stack_info e
+# necessários para logger.exception() nos handlers.
 structlog.configure(
     processors=[
         structlog.stdlib.filter_by_level,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer() if settings.is_production else structlog.dev.ConsoleRenderer(),
+        structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+        if settings.is_production
+        else structlog.dev.ConsoleRenderer(),
     ],
     wrapper_class=structlog.stdlib.BoundLogger,
     context_class=dict,
@@ -49,20 +62,24 @@ async def lifespan(app: FastAPI):
         tenant=settings.default_tenant,
     )
     
-    # Testa conexão com Supabase
+    # Testa conexão com Supabase e aquece pool HTTP + caches antes de
+    # aceitar tráfego (primeira mensagem real não paga o cold start)
     try:
         from app.db import db
         tenant = await db.get_tenant_by_slug(settings.default_tenant)
         if tenant:
             logger.info("tenant_loaded", tenant=tenant["name"])
+            await db.search_menu(tenant["id"], limit=1)
         else:
             logger.warning("tenant_not_found", slug=settings.default_tenant)
     except Exception as e:
         logger.error("supabase_connection_error", error=str(e))
     
     yield
-    
+
     # Shutdown
+    from app.db import close_supabase_client
+    close_supabase_client()
     logger.info("app_shutting_down")
 
 
@@ -73,6 +90,8 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    # Serialização de resposta via orjson (C) em todas as rotas
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -91,7 +110,7 @@ app.add_middleware(
 # ==========================================
 
 @app.exception_handler(LiaError)
-async def lia_error_handler(request: Request, exc: LiaError) -> JSONResponse:
+async def lia_error_handler(request: Request, exc: LiaError) -> ORJSONResponse:
     """Handler para exceções do sistema."""
     logger.warning(
         "lia_error",
@@ -101,14 +120,14 @@ async def lia_error_handler(request: Request, exc: LiaError) -> JSONResponse:
         path=request.url.path,
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content=exc.to_dict(),
     )
 
 
 @app.exception_handler(Exception)
-async def generic_error_handler(request: Request, exc: Exception) -> JSONResponse:
+async def generic_error_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """Handler para exceções não tratadas."""
     logger.exception(
         "unhandled_error",
@@ -116,7 +135,7 @@ async def generic_error_handler(request: Request, exc: Exception) -> JSONRespons
         path=request.url.path,
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "INTERNAL_ERROR",
@@ -148,19 +167,33 @@ async def health() -> Dict[str, Any]:
     }
 
 
+# Último /ready bem-sucedido: (timestamp monotônico, payload). Probes do
+# Kubernetes chegam a cada poucos segundos; sem isso cada probe vira uma
+# query no Supabase
+_ready_cache: tuple[float, Dict[str, Any]] | None = None
+
+
 @app.get("/ready")
 async def ready() -> Dict[str, Any]:
     """
     Readiness check - verifica dependências.
-    
+
     Usado pelo Kubernetes/Docker para saber se a aplicação
-    está pronta para receber requisições.
+    está pronta para receber requisições. Resultado positivo é
+    reaproveitado por `readiness_cache_ttl` segundos.
     """
+    global _ready_cache
+
+    if _ready_cache is not None:
+        checked_at, cached = _ready_cache
+        if time.monotonic() - checked_at < settings.readiness_cache_ttl:
+            return ORJSONResponse(content=cached, status_code=200)
+
     checks: Dict[str, Any] = {
         "status": "ready",
         "checks": {},
     }
-    
+
     # Check Supabase
     try:
         from app.db import db
@@ -177,7 +210,10 @@ async def ready() -> Dict[str, Any]:
     checks["checks"]["evolution"] = "ok" if settings.evolution_base_url else "not_configured"
     
     status_code = 200 if checks["status"] == "ready" else 503
-    return JSONResponse(content=checks, status_code=status_code)
+    # Só cacheia sucesso: falha deve ser reavaliada no próximo probe
+    if status_code == 200:
+        _ready_cache = (time.monotonic(), checks)
+    return ORJSONResponse(content=checks, status_code=status_code)
 
 
 # ==========================================
@@ -5,9 +5,11 @@ Faz match (fuzzy) entre os itens interpretados e o cardapio.
 """
 from __future__ import annotations
 
+import sys
 from collections import defaultdict
+from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, DefaultDict, Dict, Iterable, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.core.schemas import (
     CartItem,
@@ -20,6 +22,121 @@ from app.services.interpreter.parser import ParsedItem
 from app.utils.text import find_best_match, find_matches, make_fingerprint, normalize_text
 
 
+@dataclass(frozen=True, slots=True)
+class PreparedMenuIndex:
+    """Índice de cardápio pré-processado para o matcher.
+
+    Guarda, em arrays paralelos aos produtos, o nome normalizado e o
+    fingerprint — calculados uma vez por versão de cardápio em vez de a
+    cada item × produto × chamada.
+    """
+
+    products: Tuple[Dict[str, Any], ...]
+    product_names: Tuple[str, ...]
+    product_names_norm: Tuple[str, ...]
+    product_fps: Tuple[Optional[str], ...]
+    fp_index: Dict[str, Tuple[int, ...]]
+    token_index: Dict[str, frozenset]
+    additions_by_parent: Dict[Optional[str], List[Dict[str, Any]]]
+    addition_labels_by_parent: Dict[Optional[str], List[str]]
+    addition_fp_by_parent: Dict[Optional[str], Dict[str, Dict[str, Any]]]
+
+
+# Memoização por conteúdo: a chave cobre todos os campos que o índice
+# consome (pdv, parent_pdv, tipo, nome, fingerprint e preço) — mudou
+# qualquer um deles, inclusive só preço, nome de exibição ou o pai de um
+# adicional, que o refresh periódico do cardápio existe para propagar,
+# muda a chave e o índice é reconstruído
+_prepared_cache: Dict[tuple, PreparedMenuIndex] = {}
+_PREPARED_CACHE_MAX = 32
+
+_ZERO = Decimal("0")
+
+
+def build_prepared_menu_index(menu_index: List[Dict[str, Any]]) -> PreparedMenuIndex:
+    """Constrói (ou reaproveita) o índice pré-processado do cardápio."""
+    key = tuple(
+        (
+            entry.get("pdv"),
+            entry.get("parent_pdv"),
+            entry.get("item_type"),
+            entry.get("nome_original"),
+            entry.get("fingerprint"),
+            entry.get("price"),
+        )
+        for entry in menu_index
+    )
+    prepared = _prepared_cache.get(key)
+    if prepared is None:
+        # Strings vindas do JSON são alocações novas a cada fetch; internar
+        # os campos usados como chave/comparação deduplica memória e deixa
+        # os `==` do match resolverem por identidade
+        for entry in menu_index:
+            for field in ("pdv", "parent_pdv", "item_type", "fingerprint"):
+                value = entry.get(field)
+                if type(value) is str:
+                    entry[field] = sys.intern(value)
+            # Preço convertido para Decimal uma vez por versão de cardápio,
+            # não a cada item do pedido
+            price = entry.get("price")
+            entry["_price_dec"] = Decimal(str(price)) if price is not None else _ZERO
+
+        products: List[Dict[str, Any]] = []
+        additions_by_parent: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+        for entry in menu_index:
+            item_type = entry.get("item_type")
+            if item_type == "product":
+                products.append(entry)
+            elif item_type == "addition":
+                additions_by_parent[entry.get("parent_pdv")].append(entry)
+
+        names = tuple(p.get("nome_original", "") for p in products)
+        names_norm = tuple(normalize_text(n) for n in names)
+
+        # Índices invertidos: fingerprint -> posições e token -> posições,
+        # para que match exato e filtros por palavra não varram a lista toda
+        fp_map: Dict[str, List[int]] = defaultdict(list)
+        for i, fp in enumerate(p.get("fingerprint") for p in products):
+            if fp:
+                fp_map[fp].append(i)
+        token_map: Dict[str, set] = defaultdict(set)
+        for i, name_norm in enumerate(names_norm):
+            for token in name_norm.split():
+                token_map[token].add(i)
+
+        # Labels e fingerprints dos adicionais também são fixos por versão
+        # de cardápio: match exato vira lookup em dict
+        addition_labels_by_parent: Dict[Optional[str], List[str]] = {}
+        addition_fp_by_parent: Dict[Optional[str], Dict[str, Dict[str, Any]]] = {}
+        for parent, entries in additions_by_parent.items():
+            labels = [_addition_label(e) for e in entries]
+            addition_labels_by_parent[parent] = labels
+            addition_fp_by_parent[parent] = {
+                make_fingerprint(label): entry for label, entry in zip(labels, entries)
+            }
+
+        prepared = PreparedMenuIndex(
+            products=tuple(products),
+            product_names=names,
+            product_names_norm=names_norm,
+            product_fps=tuple(p.get("fingerprint") for p in products),
+            fp_index={fp: tuple(idxs) for fp, idxs in fp_map.items()},
+            token_index={token: frozenset(idxs) for token, idxs in token_map.items()},
+            additions_by_parent=dict(additions_by_parent),
+            addition_labels_by_parent=addition_labels_by_parent,
+            addition_fp_by_parent=addition_fp_by_parent,
+        )
+        if len(_prepared_cache) >= _PREPARED_CACHE_MAX:
+            _prepared_cache.clear()
+        _prepared_cache[key] = prepared
+    return prepared
+
+
+def invalidate_prepared_menu_index() -> None:
+    """Descarta os índices memoizados (ex.: após atualização de cardápio)."""
+    _prepared_cache.clear()
+
+
 def match_items(
     items: List[ParsedItem],
     menu_index: List[Dict[str, Any]],
@@ -31,29 +148,29 @@ def match_items(
     menu_index esperado (view v_menu_search_index):
     - pdv, parent_pdv, nome_original, price, item_type, fingerprint
     """
-    products, additions_by_parent = _build_menu_index(menu_index)
+    menu = build_prepared_menu_index(menu_index)
 
     interpreted_items: List[CartItem] = []
     pendencies: List[CartPendency] = []
 
     for item in items:
         if item.is_additional_only:
-            pendencies.append(_pendency_for_additional_only(item, products))
+            pendencies.append(_pendency_for_additional_only(item, menu))
             continue
 
-        product = _match_product(item, products)
+        product = _match_product(item, menu)
         if not product:
-            pendencies.append(_pendency_for_missing_product(item, products))
+            pendencies.append(_pendency_for_missing_product(item, menu))
             continue
 
-        additions = _match_additions(item, additions_by_parent.get(product["pdv"], []), pendencies, product)
+        additions = _match_additions(item, menu, pendencies, product)
         observacoes = _build_observacoes(item)
 
         cart_item = CartItem(
             pdv=product["pdv"],
             nome=product["nome_original"],
             quantidade=item.quantity,
-            preco_unitario=_to_decimal(product.get("price")),
+            preco_unitario=product["_price_dec"],
             adicionais=additions,
             observacoes=observacoes,
         )
@@ -68,32 +185,17 @@ def match_items(
     )
 
 
-def _build_menu_index(
-    menu_index: List[Dict[str, Any]],
-) -> tuple[List[Dict[str, Any]], DefaultDict[Optional[str], List[Dict[str, Any]]]]:
-    products: List[Dict[str, Any]] = []
-    additions_by_parent: DefaultDict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
-
-    for entry in menu_index:
-        item_type = entry.get("item_type")
-        if item_type == "product":
-            products.append(entry)
-        elif item_type == "addition":
-            additions_by_parent[entry.get("parent_pdv")].append(entry)
-
-    return products, additions_by_parent
-
-
-def _match_product(item: ParsedItem, products: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+def _match_product(item: ParsedItem, menu: PreparedMenuIndex) -> Optional[Dict[str, Any]]:
     query = item.match_text or item.name
     query_fp = make_fingerprint(query)
 
-    # Exact fingerprint match
-    exact = [p for p in products if p.get("fingerprint") == query_fp]
+    # Exact fingerprint match (índice invertido)
+    exact = menu.fp_index.get(query_fp, ())
     if len(exact) == 1:
-        return exact[0]
+        return menu.products[exact[0]]
 
     query_norm = normalize_text(query)
+    all_indices = range(len(menu.products))
 
     # Batata frita com bacon/queijo: filtra por tokens para evitar escolher "batata frita" simples
     if "batata frita" in query_norm and ("bacon" in query_norm or "queijo" in query_norm):
@@ -103,91 +205,125 @@ def _match_product(item: ParsedItem, products: List[Dict[str, Any]]) -> Optional
         if "queijo" in query_norm:
             required_tokens.append("queijo")
 
-        filtered: List[Dict[str, Any]] = []
-        for p in products:
-            name_norm = normalize_text(p.get("nome_original", ""))
-            if "batata frita" in name_norm and all(token in name_norm for token in required_tokens):
-                filtered.append(p)
+        filtered = [
+            i
+            for i in _indices_with_phrase(menu, "batata frita")
+            if all(token in menu.product_names_norm[i] for token in required_tokens)
+        ]
         if filtered:
             if item.size_hint:
-                filtered = _filter_by_size_hint(filtered, item.size_hint)
-            candidate = _best_match(query, filtered)
+                filtered = _filter_by_size_hint(menu, filtered, item.size_hint)
+            candidate = _best_match(query, menu, filtered)
             if candidate:
                 return candidate
 
     # Suco de morango: filtra por sabor para evitar match errado
     if "suco" in query_norm and "morango" in query_norm:
         filtered = [
-            p
-            for p in products
-            if "suco" in normalize_text(p.get("nome_original", ""))
-            and "morango" in normalize_text(p.get("nome_original", ""))
+            i
+            for i in _indices_with_phrase(menu, "suco")
+            if "morango" in menu.product_names_norm[i]
         ]
         if filtered:
-            candidate = _best_match(query, filtered)
+            candidate = _best_match(query, menu, filtered)
             if candidate:
                 return candidate
 
     # Prefer plain "batata frita" when query says tradicional
     if "batata frita" in query_norm and "tradicional" in query_norm:
-        filtered = _filter_plain_batata(products)
+        filtered = _filter_plain_batata(menu)
         if item.size_hint:
-            filtered = _filter_by_size_hint(filtered, item.size_hint)
-        candidate = _best_match(query, filtered)
+            filtered = _filter_by_size_hint(menu, filtered, item.size_hint)
+        candidate = _best_match(query, menu, filtered)
         if candidate:
             return candidate
 
     # Size hint for batata frita
     if item.size_hint and "batata frita" in query_norm:
-        filtered = _filter_by_size_hint(products, item.size_hint)
-        candidate = _best_match(query, filtered)
+        filtered = _filter_by_size_hint(menu, list(all_indices), item.size_hint)
+        candidate = _best_match(query, menu, filtered)
         if candidate:
             return candidate
 
-    return _best_match(query, products)
+    return _best_match(query, menu, list(all_indices))
 
 
-def _best_match(query: str, products: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    if not products:
+def _indices_with_phrase(menu: PreparedMenuIndex, phrase: str) -> List[int]:
+    """Índices dos produtos cujo nome normalizado contém a frase.
+
+    Interseta os conjuntos do índice invertido e só então confere a frase
+    completa nos candidatos. Se a interseção não achar nada (a frase pode
+    cruzar limites de token, ex.: "suco" dentro de "sucos"), cai no scan
+    por substring que o código fazia antes.
+    """
+    sets = [menu.token_index.get(token) for token in phrase.split()]
+    if sets and all(s is not None for s in sets):
+        candidates = frozenset.intersection(*sets)
+        hits = [i for i in sorted(candidates) if phrase in menu.product_names_norm[i]]
+        if hits:
+            return hits
+    return [
+        i
+        for i in range(len(menu.products))
+        if phrase in menu.product_names_norm[i]
+    ]
+
+
+def _best_match(
+    query: str,
+    menu: PreparedMenuIndex,
+    indices: List[int],
+) -> Optional[Dict[str, Any]]:
+    if not indices:
         return None
-    names = [p.get("nome_original", "") for p in products]
-    match_name, _score = find_best_match(query, names, threshold=0.6)
+    names = [menu.product_names[i] for i in indices]
+    names_norm = [menu.product_names_norm[i] for i in indices]
+    match_name, _score = find_best_match(query, names, threshold=0.6, candidates_norm=names_norm)
     if not match_name:
         return None
-    for p in products:
-        if p.get("nome_original") == match_name:
-            return p
+    for i in indices:
+        if menu.product_names[i] == match_name:
+            return menu.products[i]
     return None
 
 
-def _filter_by_size_hint(products: List[Dict[str, Any]], size_hint: str) -> List[Dict[str, Any]]:
+def _filter_by_size_hint(
+    menu: PreparedMenuIndex,
+    indices: List[int],
+    size_hint: str,
+) -> List[int]:
     tokens = []
     if size_hint == "1/4":
         tokens = ["1/4", "1/4 por", "1/4 porcao"]
     elif size_hint == "1/2":
         tokens = ["meia", "1/2"]
 
-    filtered: List[Dict[str, Any]] = []
-    for p in products:
-        name_norm = normalize_text(p.get("nome_original", ""))
-        if any(token in name_norm for token in tokens):
-            filtered.append(p)
-    return filtered or products
+    filtered = [
+        i
+        for i in indices
+        if any(token in menu.product_names_norm[i] for token in tokens)
+    ]
+    return filtered or indices
 
 
-def _filter_plain_batata(products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    forbidden = ["bacon", "queijo", "calabresa", "frango", "cheddar", "coracao", "catupiry", "mussarela", "tres"]
-    filtered: List[Dict[str, Any]] = []
-    for p in products:
-        name_norm = normalize_text(p.get("nome_original", ""))
-        if "batata frita" in name_norm and not any(word in name_norm for word in forbidden):
-            filtered.append(p)
-    return filtered or products
+_FORBIDDEN_BATATA = frozenset(
+    ["bacon", "queijo", "calabresa", "frango", "cheddar", "coracao", "catupiry", "mussarela", "tres"]
+)
+
+
+def _filter_plain_batata(menu: PreparedMenuIndex) -> List[int]:
+    # União dos produtos que contêm alguma palavra proibida (lookups no
+    # índice invertido em vez de busca por substring nome a nome)
+    banned: set = set()
+    for token in _FORBIDDEN_BATATA:
+        banned |= menu.token_index.get(token, frozenset())
+    filtered = [i for i in _indices_with_phrase(menu, "batata frita") if i not in banned]
+    return filtered or list(range(len(menu.products)))
 
 
 def _match_additions(
     item: ParsedItem,
-    additions: List[Dict[str, Any]],
+    menu: PreparedMenuIndex,
     pendencies: List[CartPendency],
     product: Dict[str, Any],
 ) -> List[CartItemAddition]:
@@ -195,14 +331,15 @@ def _match_additions(
     if not item.additions:
         return results
 
+    parent_pdv = product["pdv"]
     for addition_text in item.additions:
-        matched = _match_addition(addition_text, additions)
+        matched = _match_addition(addition_text, menu, parent_pdv)
         if not matched:
             pendencies.append(
                 CartPendency(
                     motivo=PendencyReason.ADICIONAL_NAO_ENCONTRADO,
                     texto_original=addition_text,
-                    sugestoes=_suggest_additions(addition_text, additions),
+                    sugestoes=_suggest_additions(addition_text, menu, parent_pdv),
                     dados_extras={"produto_base": product.get("nome_original")},
                 )
             )
@@ -213,31 +350,32 @@ def _match_additions(
                 pdv=matched["pdv"],
                 nome=_clean_addition_name(matched.get("nome_original", "")),
                 quantidade=1,
-                preco_unitario=_to_decimal(matched.get("price")),
+                preco_unitario=matched["_price_dec"],
             )
         )
     return results
 
 
-def _match_addition(text: str, additions: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+def _match_addition(
+    text: str,
+    menu: PreparedMenuIndex,
+    parent_pdv: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    additions = menu.additions_by_parent.get(parent_pdv)
     if not additions:
         return None
 
-    query_fp = make_fingerprint(text)
-    for entry in additions:
-        label_fp = make_fingerprint(_addition_label(entry))
-        if label_fp == query_fp:
-            return entry
+    # Match exato por fingerprint: lookup O(1) no dict pré-construído
+    exact = menu.addition_fp_by_parent[parent_pdv].get(make_fingerprint(text))
+    if exact is not None:
+        return exact
 
-    # fallback fuzzy
-    labels = [_addition_label(a) for a in additions]
-    match_name, _score = find_best_match(text, labels, threshold=0.6)
+    # fallback fuzzy (labels já normalizados no índice)
+    labels = menu.addition_labels_by_parent[parent_pdv]
+    match_name, _score = find_best_match(text, labels, threshold=0.6, candidates_norm=labels)
     if not match_name:
         return None
-    for entry in additions:
-        if _addition_label(entry) == match_name:
-            return entry
-    return None
+    return additions[labels.index(match_name)]
 
 
 def _addition_label(entry: Dict[str, Any]) -> str:
@@ -251,8 +389,8 @@ def _clean_addition_name(name: str) -> str:
     return cleaned.strip()
 
 
-def _pendency_for_additional_only(item: ParsedItem, products: List[Dict[str, Any]]) -> CartPendency:
-    suggestions = _suggest_products(item.name, products)
+def _pendency_for_additional_only(item: ParsedItem, menu: PreparedMenuIndex) -> CartPendency:
+    suggestions = _suggest_products(item.name, menu)
     return CartPendency(
         motivo=PendencyReason.ADICIONAL_NAO_ENCONTRADO,
         texto_original=item.raw,
@@ -261,8 +399,8 @@ def _pendency_for_additional_only(item: ParsedItem, products: List[Dict[str, Any
     )
 
 
-def _pendency_for_missing_product(item: ParsedItem, products: List[Dict[str, Any]]) -> CartPendency:
-    suggestions = _suggest_products(item.match_text or item.name, products)
+def _pendency_for_missing_product(item: ParsedItem, menu: PreparedMenuIndex) -> CartPendency:
+    suggestions = _suggest_products(item.match_text or item.name, menu)
     return CartPendency(
         motivo=PendencyReason.PRODUTO_NAO_ENCONTRADO,
         texto_original=item.raw,
@@ -271,15 +409,24 @@ def _pendency_for_missing_product(item: ParsedItem, products: List[Dict[str, Any
     )
 
 
-def _suggest_products(query: str, products: List[Dict[str, Any]]) -> List[str]:
-    names = [p.get("nome_original", "") for p in products]
-    matches = find_matches(query, names, threshold=0.6, limit=5)
+def _suggest_products(query: str, menu: PreparedMenuIndex) -> List[str]:
+    matches = find_matches(
+        query,
+        menu.product_names,
+        threshold=0.6,
+        limit=5,
+        candidates_norm=menu.product_names_norm,
+    )
     return [m[0] for m in matches]
 
 
-def _suggest_additions(query: str, additions: List[Dict[str, Any]]) -> List[str]:
-    labels = [_addition_label(a) for a in additions]
-    matches = find_matches(query, labels, threshold=0.6, limit=5)
+def _suggest_additions(
+    query: str,
+    menu: PreparedMenuIndex,
+    parent_pdv: Optional[str],
+) -> List[str]:
+    labels = menu.addition_labels_by_parent.get(parent_pdv, [])
+    matches = find_matches(query, labels, threshold=0.6, limit=5, candidates_norm=labels)
     return [m[0] for m in matches]
 
 
@@ -292,17 +439,8 @@ def _build_observacoes(item: ParsedItem) -> str:
     return " | ".join(parts)
 
 
-def _compute_confidence(pendencies: Iterable[CartPendency]) -> float:
-    count = len(list(pendencies))
-    return max(0.1, 1.0 - (0.2 * count))
-
-
-def _to_decimal(value: Any) -> Decimal:
-    if value is None:
-        return Decimal("0")
-    if isinstance(value, Decimal):
-        return value
-    return Decimal(str(value))
+def _compute_confidence(pendencies: List[CartPendency]) -> float:
+    return max(0.1, 1.0 - 0.2 * len(pendencies))
 
 
 __all__ = [
@@ -11,39 +11,88 @@ from typing import List, Optional
 
 from app.utils.text import normalize_text, parse_quantity
 
+# Engine opcional para os padrões de muitas alternativas (mesma troca dos
+# guardrails): google-re2 casa em O(n) via DFA e expõe API compatível com
+# `re`; sem o pacote, o stdlib segue valendo. Os padrões curtos/ancorados
+# ficam no `re` — o ganho do DFA aparece nas alternações longas.
+try:
+    import re2 as _regex  # type: ignore[import-not-found]
+except ImportError:
+    _regex = re
+
 _WORD_NUMBERS = r"um|uma|dois|duas|tres|três|quatro|cinco|seis|sete|oito|nove|dez"
-_ITEM_START_RE = re.compile(
+_ITEM_START_RE = _regex.compile(
     rf"(?:^|\n+|\s+e\s+|\s*,\s*|\s*;\s*)({_WORD_NUMBERS}|\d+)\b\s*(?:x\s*)?",
     re.IGNORECASE,
 )
-_SEGMENT_RE = re.compile(r"^(\d+)\s*(?:x\s*)?(.*)$", re.IGNORECASE)
-_WORD_QTY_RE = re.compile(rf"^({_WORD_NUMBERS})\b", re.IGNORECASE)
+# Prefixo de quantidade do segmento ("2", "2x", "dois") em um único match
+# ancorado: substitui os dois padrões sequenciais que o _parse_segment
+# aplicava (dígito com x opcional, depois número por extenso)
+_QTY_PREFIX_RE = re.compile(
+    rf"^(?:(?P<num>\d+)\s*(?:x\s*)?|(?P<word>{_WORD_NUMBERS})\b)",
+    re.IGNORECASE,
+)
+# Fast path do prefixo por extenso: o caso comum ("dois burguer") resolve
+# com partition + lookup no dict, sem entrar no motor de regex. Restrito
+# às palavras de _WORD_NUMBERS — o mapa completo de parse_quantity aceita
+# "onze"/"doze", que o parser nunca tratou como início de item
+_WORD_QTY_MAP = {
+    "um": 1, "uma": 1, "dois": 2, "duas": 2, "tres": 3, "três": 3,
+    "quatro": 4, "cinco": 5, "seis": 6, "sete": 7, "oito": 8, "nove": 9,
+    "dez": 10,
+}
 _CUTOFF_RE = re.compile(r"\b(para\s+a|para\s+o|pagamento|entrega)\b", re.IGNORECASE)
-_TIMESTAMP_RE = re.compile(r"^\[\d{1,2}:\d{2},\s*\d{2}/\d{2}/\d{4}\]\s+[^:]+:\s*")
-_GREETING_RE = re.compile(
+_GREETING_RE = _regex.compile(
     r"^\s*(oi|ola|olá|boa\s+noite|bom\s+dia|boa\s+tarde|opa|oiii+|bia\s+noite)"
     r"(\s+(boa\s+noite|bom\s+dia|boa\s+tarde))?\s*$",
     re.IGNORECASE,
 )
-_LEADING_VERBS_RE = re.compile(
-    r"^\s*(gostaria\s+de\s+fazer\s+um\s+pedido|gostaria\s+de\s+fazer|"
-    r"gostaria\s+de|gostaria|queria|quero|ve|vê|ver|manda|pode|vou|vai)\b",
-    re.IGNORECASE,
-)
-_CONTEXT_RE = re.compile(
-    r"\b(rua|bairro|numero|número|prox|próx|praça|entrega|entregar|pagamento|pix|"
-    r"debito|débito|credito|crédito|cartao|cartão|troco|casa|apto|apartamento|"
-    r"blz|ok|tudo\s+bem|quantos|deu)\b",
-    re.IGNORECASE,
+# Palavras de contexto (endereço/pagamento/small talk). Em vez de uma
+# alternação de ~25 ramos percorrida pelo motor de regex a cada linha,
+# tokeniza a linha uma vez e testa pertencimento no frozenset — O(tokens)
+# com lookup hasheado, mesma troca feita no vocabulário dos guardrails
+_CONTEXT_WORDS = frozenset(
+    "rua bairro numero número prox próx praça entrega entregar pagamento pix "
+    "debito débito credito crédito cartao cartão troco casa apto apartamento "
+    "blz ok quantos deu".split()
 )
+_TUDO_BEM_RE = re.compile(r"\btudo\s+bem\b", re.IGNORECASE)
+_TOKEN_RE = re.compile(r"\w+")
 
 _NOTE_KEYWORDS = [
     "cortado ao meio",
     "bem passado",
 ]
+_NOTE_PATTERNS = [(kw, re.compile(re.escape(kw), re.IGNORECASE)) for kw in _NOTE_KEYWORDS]
+
+# Demais padroes do parse compilados no import (rodam por segmento)
+_HAS_X_RE = re.compile(rf"^({_WORD_NUMBERS}|\d+)?\s*x\b", re.IGNORECASE)
+_ADICIONAL_RE = re.compile(r"\badicional\b", re.IGNORECASE)
+_X_WORD_RE = re.compile(r"\bx\b", re.IGNORECASE)
+_COM_RE = re.compile(r"\bcom\b", re.IGNORECASE)
+_X_SPACE_RE = re.compile(r"^x\s+", re.IGNORECASE)
+_REMOVALS_RE = re.compile(r"\bsem\s+([^,]+?)(?=(\bsem\b|\bcom\b|$))", re.IGNORECASE)
+_E_CONN_RE = re.compile(r"\s+e\s+", re.IGNORECASE)
+# Prefixos descartáveis (timestamp, saudações, "eu", verbos de pedido,
+# "e" solto) fundidos em uma única alternação ancorada: aplicada em loop,
+# cada strip aloca uma string nova só quando algo foi de fato removido,
+# em vez de cinco re.sub sequenciais percorrendo a linha inteira
+_LEADING_STRIP_RE = _regex.compile(
+    r"^\s*(?:"
+    r"\[\d{1,2}:\d{2},\s*\d{2}/\d{2}/\d{4}\]\s+[^:]+:"
+    r"|(?:oiii+|oi|ola|olá|boa\s+noite|bom\s+dia|boa\s+tarde|opa)\b\s*,?"
+    r"|eu\b"
+    r"|(?:gostaria\s+de\s+fazer\s+um\s+pedido|gostaria\s+de\s+fazer|gostaria\s+de|"
+    r"gostaria|queria|quero|ve|vê|ver|manda|pode|vou|vai)\b"
+    r"|e\b"
+    r")[\s,.\-]*",
+    re.IGNORECASE,
+)
+_LIST_SPLIT_RE = re.compile(r"\s+e\s+|,", re.IGNORECASE)
+_TRAILING_CONN_RE = re.compile(r"\b(e|de)\b$", re.IGNORECASE)
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedItem:
     raw: str
     quantity: int
@@ -82,6 +131,15 @@ def parse_order_text(text: str) -> List[ParsedItem]:
 def _cut_context(text: str) -> str:
     if "\n" in text:
         return text
+    # Prefiltro por substring (busca em C): só entra no regex se algum
+    # literal dos marcadores puder estar presente
+    lowered = text.lower()
+    if (
+        "para" not in lowered
+        and "pagamento" not in lowered
+        and "entrega" not in lowered
+    ):
+        return text
     match = _CUTOFF_RE.search(text)
     if not match:
         return text
@@ -89,61 +147,75 @@ def _cut_context(text: str) -> str:
 
 
 def _split_segments(text: str) -> List[str]:
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
     segments: List[str] = []
-
-    for raw_line in lines:
+    for raw_line in text.splitlines():
+        raw_line = raw_line.strip()
+        if not raw_line:
+            continue
         line = _strip_metadata(raw_line)
         if not line or _is_context_line(line):
             continue
+        segments.extend(_iter_line_segments(line))
+    return segments
 
-        matches = list(_ITEM_START_RE.finditer(line))
-        if not matches:
-            segments.append(line.strip(" ,;"))
-            continue
 
-        for idx, match in enumerate(matches):
-            start = match.start(1)
-            end = matches[idx + 1].start(1) if idx + 1 < len(matches) else len(line)
-            segment = line[start:end].strip(" ,;")
-            if segment:
-                segments.append(segment)
-    return segments
+def _iter_line_segments(line: str):
+    # Itera os matches em streaming: só o match corrente e o anterior
+    # ficam vivos, em vez de materializar a lista inteira para poder
+    # olhar o início do próximo segmento
+    it = _ITEM_START_RE.finditer(line)
+    prev = next(it, None)
+    if prev is None:
+        yield line.strip(" ,;")
+        return
+    for match in it:
+        segment = line[prev.start(1):match.start(1)].strip(" ,;")
+        if segment:
+            yield segment
+        prev = match
+    segment = line[prev.start(1):].strip(" ,;")
+    if segment:
+        yield segment
 
 
 def _parse_segment(segment: str) -> Optional[ParsedItem]:
     segment = segment.strip()
-    match = _SEGMENT_RE.match(segment)
-    if match:
-        quantity = int(match.group(1))
-        desc = match.group(2).strip()
+    head, _, tail = segment.partition(" ")
+    word_qty = _WORD_QTY_MAP.get(head.lower())
+    if word_qty is not None:
+        quantity = word_qty
+        desc = tail.strip()
     else:
-        word_match = _WORD_QTY_RE.match(segment)
-        if word_match:
-            quantity = parse_quantity(word_match.group(1))
-            desc = segment[word_match.end():].strip()
+        match = _QTY_PREFIX_RE.match(segment)
+        if match:
+            word = match.group("word")
+            quantity = parse_quantity(word) if word else int(match.group("num"))
+            desc = segment[match.end():].strip()
         else:
             quantity = 1
-            desc = segment.strip()
-    raw = segment.strip()
-    has_x = bool(re.match(rf"^({_WORD_NUMBERS}|\d+)?\s*x\b", segment, re.IGNORECASE))
+            desc = segment
+    raw = segment
+    has_x = bool(_HAS_X_RE.match(segment))
 
     notes, desc = _extract_notes(desc)
-    is_additional_only = bool(re.search(r"\badicional\b", normalize_text(desc))) and not re.search(
-        r"\bx\b", raw, re.IGNORECASE
-    )
-    desc = re.sub(r"\badicional\b", "", desc, flags=re.IGNORECASE).strip()
+    # Prefiltro por substring antes do regex, e o sub (no-op quando a
+    # palavra não está presente) só roda quando houve match
+    norm = normalize_text(desc)
+    has_adicional = "adicional" in norm and _ADICIONAL_RE.search(norm) is not None
+    is_additional_only = has_adicional and not _X_WORD_RE.search(raw)
+    if has_adicional:
+        desc = _ADICIONAL_RE.sub("", desc).strip()
 
     desc, removals = _extract_removals(desc)
 
     base_name = desc
     additions: List[str] = []
-    if re.search(r"\bcom\b", desc, re.IGNORECASE):
-        base_name, add_part = re.split(r"\bcom\b", desc, maxsplit=1, flags=re.IGNORECASE)
+    if _COM_RE.search(desc):
+        base_name, add_part = _COM_RE.split(desc, maxsplit=1)
         additions = _split_list(add_part)
 
     base_name = _clean_text(base_name)
-    if has_x and not re.match(r"^x\s+", base_name, re.IGNORECASE):
+    if has_x and not _X_SPACE_RE.match(base_name):
         base_name = f"x {base_name}".strip()
 
     item = ParsedItem(
@@ -162,61 +234,64 @@ def _parse_segment(segment: str) -> Optional[ParsedItem]:
 def _extract_notes(text: str) -> tuple[List[str], str]:
     notes: List[str] = []
     cleaned = text
-    for keyword in _NOTE_KEYWORDS:
-        if keyword in normalize_text(cleaned):
+    # Normaliza uma vez e refaz só quando o texto muda, em vez de
+    # renormalizar a cada palavra-chave testada
+    normalized = normalize_text(cleaned)
+    for keyword, pattern in _NOTE_PATTERNS:
+        if keyword in normalized:
             notes.append(keyword)
-            cleaned = re.sub(keyword, "", cleaned, flags=re.IGNORECASE).strip()
+            cleaned = pattern.sub("", cleaned).strip()
+            normalized = normalize_text(cleaned)
     return notes, cleaned
 
 
 def _extract_removals(text: str) -> tuple[str, List[str]]:
     removals: List[str] = []
-    pattern = re.compile(r"\bsem\s+([^,]+?)(?=(\bsem\b|\bcom\b|$))", re.IGNORECASE)
-    for match in pattern.finditer(text):
+    for match in _REMOVALS_RE.finditer(text):
         part = match.group(1).strip()
         removals.extend(_split_list(part))
 
-    cleaned = pattern.sub("", text)
+    cleaned = _REMOVALS_RE.sub("", text)
     if removals:
-        cleaned = re.sub(r"\s+e\s+", " ", cleaned, flags=re.IGNORECASE)
+        cleaned = _E_CONN_RE.sub(" ", cleaned)
     cleaned = _clean_text(cleaned)
     return cleaned, removals
 
 
 def _strip_metadata(text: str) -> str:
-    cleaned = _TIMESTAMP_RE.sub("", text).strip()
-    cleaned = re.sub(
-        r"^\s*(oiii+|oi|ola|olá|boa\s+noite|bom\s+dia|boa\s+tarde|opa)\s*,?\s*",
-        "",
-        cleaned,
-        flags=re.IGNORECASE,
-    )
-    cleaned = re.sub(r"^\s*(boa\s+noite|bom\s+dia|boa\s+tarde)\s*,?\s*", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r"^\s*eu\s+", "", cleaned, flags=re.IGNORECASE)
-    cleaned = _LEADING_VERBS_RE.sub("", cleaned).strip(" ,.-")
-    cleaned = re.sub(r"^\s*e\s+", "", cleaned, flags=re.IGNORECASE)
-    return cleaned.strip()
+    cleaned = text
+    while True:
+        match = _LEADING_STRIP_RE.match(cleaned)
+        if not match:
+            break
+        cleaned = cleaned[match.end():]
+    return cleaned.strip(" ,.-")
 
 
 def _is_context_line(text: str) -> bool:
     if _GREETING_RE.match(text):
         return True
-    return bool(_CONTEXT_RE.search(text))
+    lowered = text.lower()
+    if not _CONTEXT_WORDS.isdisjoint(_TOKEN_RE.findall(lowered)):
+        return True
+    return bool(_TUDO_BEM_RE.search(lowered))
 
 
 def _split_list(text: str) -> List[str]:
     if not text:
         return []
-    parts = re.split(r"\s+e\s+|,", text, flags=re.IGNORECASE)
+    parts = _LIST_SPLIT_RE.split(text)
     return [_clean_text(p) for p in parts if _clean_text(p)]
 
 
 def _clean_text(text: str) -> str:
+    # Parênteses e colapso de espaços em str puro (roda em C); só o
+    # conector final segue em regex, que precisa de \b case-insensitive
     cleaned = text.strip().strip(",;")
-    cleaned = re.sub(r"[()]", "", cleaned)
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    cleaned = re.sub(r"\b(e|de)\b$", "", cleaned, flags=re.IGNORECASE).strip()
-    return cleaned.strip()
+    if "(" in cleaned or ")" in cleaned:
+        cleaned = cleaned.replace("(", "").replace(")", "")
+    cleaned = _TRAILING_CONN_RE.sub("", cleaned)
+    return " ".join(cleaned.split())
 
 
 __all__ = [
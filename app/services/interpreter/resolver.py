@@ -16,6 +16,29 @@ _SIZE_HINT_PATTERNS = [
     (re.compile(r"\b(1/2|meia\s+porcao|meia\s+porcao|meia)\b", re.IGNORECASE), "1/2"),
 ]
 
+# Padroes do _resolve_item compilados no import: re.sub com string passa
+# pelo cache interno do modulo re a cada chamada, e isso roda por item
+_X_PREFIX_RE = re.compile(r"^x(?=[a-z])", re.IGNORECASE)
+_COMPLETO_RE = re.compile(r"\bcomplet[oa]s?\b", re.IGNORECASE)
+_X_BURG_RE = re.compile(r"\bx\s+burg\b", re.IGNORECASE)
+_EVILHA_RE = re.compile(r"\bevilha\b", re.IGNORECASE)
+_COCA_RE = re.compile(r"\bcoca\b", re.IGNORECASE)
+# Typos sem dependência de contexto corrigidos em uma varredura só: a
+# alternação única substitui cinco re.sub sequenciais, cada um refazendo
+# a string inteira. "x burg" e "coca" ficam fora — dependem dos tokens
+# ao redor
+_TYPO_RE = re.compile(r"\b(migon|evilha|tbm|tambem|burger|bata\s+frita)\b", re.IGNORECASE)
+_TYPO_MAP = {
+    "migon": "mignon",
+    "evilha": "ervilha",
+    "tbm": "",
+    "tambem": "",
+    "burger": "burguer",
+    "bata frita": "batata frita",
+}
+_LITROS_RE = re.compile(r"\b(\d+)\s*l(t|itros)?\b", re.IGNORECASE)
+_WS_RE = re.compile(r"\s+")
+
 
 def resolve_parsed_items(items: List[ParsedItem]) -> List[ParsedItem]:
     """
@@ -37,7 +60,7 @@ def _resolve_item(item: ParsedItem) -> ParsedItem:
     base = normalize_text(item.name)
 
     # normaliza "xegg" -> "x egg"
-    base = re.sub(r"^x(?=[a-z])", "x ", base, flags=re.IGNORECASE)
+    base = _X_PREFIX_RE.sub("x ", base)
 
     # "careca" => sem salada geral
     if "careca" in base:
@@ -45,26 +68,17 @@ def _resolve_item(item: ParsedItem) -> ParsedItem:
         item.removals.append("salada geral")
 
     # remove "completo(s)" para melhorar match
-    base = re.sub(r"\bcomplet[oa]s?\b", "", base, flags=re.IGNORECASE).strip()
+    base = _COMPLETO_RE.sub("", base).strip()
 
-    # "burger" => "burguer"
-    base = re.sub(r"\bburger\b", "burguer", base, flags=re.IGNORECASE)
+    # correcoes comuns de typo (uma varredura, replacement via dict)
+    base = _TYPO_RE.sub(lambda m: _TYPO_MAP[_WS_RE.sub(" ", m.group(1).lower())], base)
 
     # "burg" => "burguer"
-    base = re.sub(r"\bx\s+burg\b", "x burguer", base, flags=re.IGNORECASE)
-
-    # correcoes comuns de typo
-    base = re.sub(r"\bmigon\b", "mignon", base, flags=re.IGNORECASE)
-    base = re.sub(r"\bevilha\b", "ervilha", base, flags=re.IGNORECASE)
-    base = re.sub(r"\btbm\b", "", base, flags=re.IGNORECASE)
-    base = re.sub(r"\btambem\b", "", base, flags=re.IGNORECASE)
+    base = _X_BURG_RE.sub("x burguer", base)
 
     # normaliza coca
     if "coca cola" not in base:
-        base = re.sub(r"\bcoca\b", "coca cola", base, flags=re.IGNORECASE)
-
-    # correcao simples de typo
-    base = re.sub(r"\bbata\s+frita\b", "batata frita", base, flags=re.IGNORECASE)
+        base = _COCA_RE.sub("coca cola", base)
 
     # size hints
     size_hint = _extract_size_hint(base)
@@ -78,7 +92,7 @@ def _resolve_item(item: ParsedItem) -> ParsedItem:
             base = "batata frita"
 
     # 2 l / 2 lt => 2 litros
-    base = re.sub(r"\b(\d+)\s*l(t|itros)?\b", r"\1 litros", base, flags=re.IGNORECASE)
+    base = _LITROS_RE.sub(r"\1 litros", base)
 
     # normalize additions/removals to improve matching
     item.additions = [normalize_text(a) for a in item.additions if a]
@@ -87,7 +101,7 @@ def _resolve_item(item: ParsedItem) -> ParsedItem:
         if not removal:
             continue
         cleaned = normalize_text(removal)
-        cleaned = re.sub(r"\bevilha\b", "ervilha", cleaned, flags=re.IGNORECASE)
+        cleaned = _EVILHA_RE.sub("ervilha", cleaned)
         normalized_removals.append(cleaned)
     item.removals = _dedupe(normalized_removals)
 
@@ -108,17 +122,13 @@ def _extract_size_hint(text: str) -> Optional[str]:
 
 
 def _compact_spaces(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+    return _WS_RE.sub(" ", text).strip()
 
 
 def _dedupe(items: List[str]) -> List[str]:
-    seen = set()
-    result: List[str] = []
-    for item in items:
-        if item not in seen:
-            seen.add(item)
-            result.append(item)
-    return result
+    # dict preserva ordem de inserção: um único passo em C no lugar do
+    # loop Python com set auxiliar
+    return list(dict.fromkeys(items))
 
 
 __all__ = [
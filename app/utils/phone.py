@@ -3,9 +3,12 @@ Utilitários para manipulação de números de telefone.
 """
 from __future__ import annotations
 
-import re
 from typing import Optional
 
+# Bytes não numéricos (ASCII): o bytes.translate com delete-table filtra
+# os dígitos em C, sem despacho de regex por mensagem recebida
+_NON_DIGITS = bytes(b for b in range(128) if not (0x30 <= b <= 0x39))
+
 
 def normalize_phone(phone: str) -> str:
     """
@@ -26,7 +29,7 @@ def normalize_phone(phone: str) -> str:
         return ""
     
     # Remove tudo exceto dígitos
-    digits = re.sub(r"\D", "", phone)
+    digits = phone.encode("ascii", "ignore").translate(None, _NON_DIGITS).decode("ascii")
     
     # Remove zeros à esquerda
     digits = digits.lstrip("0")
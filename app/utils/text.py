@@ -4,17 +4,50 @@ Utilitários para manipulação de texto.
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import List, Optional, Sequence, Tuple
 
+from rapidfuzz import fuzz, process
 from unidecode import unidecode
 
+# Compilados uma vez: chamados por caractere de input no matcher
+_NUMBERS_RE = re.compile(r"\d+")
+_WA_BOLD_RE = re.compile(r"\*([^*]+)\*")
+_WA_ITALIC_RE = re.compile(r"_([^_]+)_")
+_WA_STRIKE_RE = re.compile(r"~([^~]+)~")
+_WA_CODE_BLOCK_RE = re.compile(r"```([^`]+)```")
+_WA_CODE_RE = re.compile(r"`([^`]+)`")
 
+# Bytes a descartar no fingerprint (tudo que não é [a-z0-9]): o
+# bytes.translate com delete-table filtra em C, sem motor de regex
+_FP_DELETE = bytes(
+    b for b in range(256) if not (ord("a") <= b <= ord("z") or ord("0") <= b <= ord("9"))
+)
+
+# Tabela de acentos do português: str.translate roda em C, enquanto o
+# unidecode despacha tabela por codepoint em Python puro. O unidecode fica
+# como fallback apenas quando sobra algo fora do ASCII (emoji etc.)
+_ACCENT_TABLE = str.maketrans(
+    "áàâãäéèêëíìîïóòôõöúùûüçñÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑ",
+    "aaaaaeeeeiiiiooooouuuucnAAAAAEEEEIIIIOOOOOUUUUCN",
+)
+
+
+def _strip_accents(text: str) -> str:
+    text = text.translate(_ACCENT_TABLE)
+    if not text.isascii():
+        text = unidecode(text)
+    return text
+
+
+@lru_cache(maxsize=8192)
 def make_fingerprint(text: str) -> str:
     """
     Cria fingerprint para busca de produtos.
-    
+
     Remove acentos, espaços, pontuação e converte para lowercase.
-    
+    Memoizada: os mesmos nomes de produto repetem a cada pedido.
+
     Exemplos:
         "X-Burguer" → "xburguer"
         "Coca-Cola 2L" → "cocacola2l"
@@ -30,21 +63,22 @@ def make_fingerprint(text: str) -> str:
         return ""
     
     # Remove acentos
-    text = unidecode(text)
+    text = _strip_accents(text)
     # Lowercase
     text = text.lower()
     # Remove tudo que não é alfanumérico
-    text = re.sub(r"[^a-z0-9]", "", text)
-    
+    text = text.encode("ascii", "ignore").translate(None, _FP_DELETE).decode("ascii")
+
     return text
 
 
+@lru_cache(maxsize=8192)
 def normalize_text(text: str) -> str:
     """
     Normaliza texto para comparação.
-    
-    Diferente do fingerprint, mantém espaços.
-    
+
+    Diferente do fingerprint, mantém espaços. Também memoizada.
+
     Args:
         text: Texto original
         
@@ -55,7 +89,7 @@ def normalize_text(text: str) -> str:
         return ""
     
     # Remove acentos
-    text = unidecode(text)
+    text = _strip_accents(text)
     # Lowercase
     text = text.lower()
     # Normaliza espaços
@@ -94,58 +128,70 @@ def extract_numbers(text: str) -> List[int]:
     Returns:
         Lista de números encontrados
     """
-    return [int(n) for n in re.findall(r"\d+", text)]
+    return [int(n) for n in _NUMBERS_RE.findall(text)]
+
+
+# Mapeamento de palavras para números (construído uma vez)
+_QUANTITY_WORD_MAP = {
+    "um": 1, "uma": 1,
+    "dois": 2, "duas": 2,
+    "tres": 3,
+    "quatro": 4,
+    "cinco": 5,
+    "seis": 6, "meia duzia": 6,
+    "sete": 7,
+    "oito": 8,
+    "nove": 9,
+    "dez": 10,
+    "onze": 11,
+    "doze": 12, "uma duzia": 12,
+}
 
 
 def parse_quantity(text: str) -> int:
     """
     Interpreta quantidade de texto.
-    
+
     Exemplos:
         "2" → 2
         "dois" → 2
         "uma" → 1
         "meia dúzia" → 6
-    
+
     Args:
         text: Texto representando quantidade
-        
+
     Returns:
         Quantidade numérica (default: 1)
     """
+    if not text:
+        return 1
+
+    # Fast path: os inputs típicos ("2", "dois") nem precisam do pipeline
+    # de normalização completo
+    stripped = text.strip().lower()
+    if stripped in _QUANTITY_WORD_MAP:
+        return _QUANTITY_WORD_MAP[stripped]
+    if stripped.isdigit():
+        return int(stripped)
+
     text = normalize_text(text)
-    
-    # Mapeamento de palavras para números
-    word_map = {
-        "um": 1, "uma": 1,
-        "dois": 2, "duas": 2,
-        "tres": 3,
-        "quatro": 4,
-        "cinco": 5,
-        "seis": 6, "meia duzia": 6,
-        "sete": 7,
-        "oito": 8,
-        "nove": 9,
-        "dez": 10,
-        "onze": 11,
-        "doze": 12, "uma duzia": 12,
-    }
-    
+
     # Tenta mapeamento de palavra
-    if text in word_map:
-        return word_map[text]
-    
+    if text in _QUANTITY_WORD_MAP:
+        return _QUANTITY_WORD_MAP[text]
+
     # Tenta converter para número
     try:
         return int(float(text))
     except ValueError:
         pass
-    
+
     # Extrai primeiro número encontrado
     numbers = extract_numbers(text)
     if numbers:
         return numbers[0]
-    
+
     # Default
     return 1
 
@@ -155,60 +201,71 @@ def similarity_ratio(s1: str, s2: str) -> float:
     Calcula similaridade entre duas strings (0.0 a 1.0).
     
     Usa algoritmo de Levenshtein normalizado.
-    
+
     Args:
         s1: Primeira string
         s2: Segunda string
-        
+
     Returns:
         Ratio de similaridade (0.0 = diferentes, 1.0 = iguais)
     """
-    from rapidfuzz import fuzz
-    
     return fuzz.ratio(s1, s2) / 100.0
 
 
+@lru_cache(maxsize=64)
+def _normalize_catalog(candidates: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Normaliza um catálogo de candidatos uma vez por conteúdo.
+
+    Chaveado pelo valor (tupla), não por id(): catálogos iguais passados
+    como objetos distintos ainda acertam o cache, e não há risco de id
+    reciclado apontar para a normalização de outra lista.
+    """
+    return tuple(normalize_text(c) for c in candidates)
+
+
 def find_best_match(
     query: str,
     candidates: Sequence[str],
     threshold: float = 0.6,
+    candidates_norm: Optional[Sequence[str]] = None,
 ) -> Tuple[Optional[str], float]:
     """
     Encontra melhor match para uma query em uma lista de candidatos.
-    
+
     Args:
         query: Texto a buscar
         candidates: Lista de candidatos
         threshold: Threshold mínimo de similaridade
-        
+        candidates_norm: Candidatos já normalizados (evita renormalizar
+            quando o chamador mantém um índice pré-processado)
+
     Returns:
         Tuple de (melhor match, score) ou (None, 0.0)
     """
-    from rapidfuzz import process, fuzz
-    
     if not candidates:
         return None, 0.0
-    
+
     # Normaliza query
     query_normalized = normalize_text(query)
-    candidates_normalized = [normalize_text(c) for c in candidates]
-    
+    if candidates_norm is None:
+        candidates_norm = _normalize_catalog(tuple(candidates))
+
     # Busca melhor match
     result = process.extractOne(
         query_normalized,
-        candidates_normalized,
+        candidates_norm,
         scorer=fuzz.WRatio,
     )
-    
+
     if result is None:
         return None, 0.0
-    
+
     match, score, index = result
     score = score / 100.0  # Normaliza para 0-1
-    
+
     if score < threshold:
         return None, score
-    
+
     # Retorna o candidato original (não normalizado)
     return candidates[index], score
 
@@ -218,43 +275,44 @@ def find_matches(
     candidates: Sequence[str],
     threshold: float = 0.6,
     limit: int = 5,
+    candidates_norm: Optional[Sequence[str]] = None,
 ) -> List[Tuple[str, float]]:
     """
     Encontra múltiplos matches para uma query.
-    
+
     Args:
         query: Texto a buscar
         candidates: Lista de candidatos
         threshold: Threshold mínimo de similaridade
         limit: Máximo de resultados
-        
+        candidates_norm: Candidatos já normalizados (opcional)
+
     Returns:
         Lista de tuples (match, score) ordenada por score
     """
-    from rapidfuzz import process, fuzz
-    
     if not candidates:
         return []
-    
+
     # Normaliza query
     query_normalized = normalize_text(query)
-    candidates_normalized = [normalize_text(c) for c in candidates]
-    
+    if candidates_norm is None:
+        candidates_norm = _normalize_catalog(tuple(candidates))
+
     # Busca matches
     results = process.extract(
         query_normalized,
-        candidates_normalized,
+        candidates_norm,
         scorer=fuzz.WRatio,
         limit=limit,
     )
-    
+
     # Filtra por threshold e retorna candidatos originais
     matches = []
     for match, score, index in results:
         score = score / 100.0
         if score >= threshold:
             matches.append((candidates[index], score))
-    
+
     return matches
 
 
@@ -271,13 +329,13 @@ def clean_whatsapp_formatting(text: str) -> str:
         Texto limpo
     """
     # Remove negrito
-    text = re.sub(r"\*([^*]+)\*", r"\1", text)
+    text = _WA_BOLD_RE.sub(r"\1", text)
     # Remove itálico
-    text = re.sub(r"_([^_]+)_", r"\1", text)
+    text = _WA_ITALIC_RE.sub(r"\1", text)
     # Remove tachado
-    text = re.sub(r"~([^~]+)~", r"\1", text)
+    text = _WA_STRIKE_RE.sub(r"\1", text)
     # Remove monospace
-    text = re.sub(r"```([^`]+)```", r"\1", text)
-    text = re.sub(r"`([^`]+)`", r"\1", text)
-    
+    text = _WA_CODE_BLOCK_RE.sub(r"\1", text)
+    text = _WA_CODE_RE.sub(r"\1", text)
+
     return text
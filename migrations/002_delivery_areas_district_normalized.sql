@@ -0,0 +1,33 @@
+-- ============================================
+-- LIA DELIVERY AGENT v2.0
+-- Migration: 002_delivery_areas_district_normalized
+-- Date: 2025-08-28
+-- ============================================
+
+-- Coluna normalizada para lookup de bairro por igualdade (índice btree)
+-- em vez de ILIKE '%...%', que força scan sequencial da tabela.
+
+ALTER TABLE delivery_areas ADD COLUMN IF NOT EXISTS district_normalized TEXT;
+
+UPDATE delivery_areas
+SET district_normalized = lower(unaccent(btrim(district)))
+WHERE district_normalized IS NULL;
+
+-- Trigger para manter a coluna em INSERT/UPDATE (mesmo padrão de
+-- name_normalized em menu_items)
+CREATE OR REPLACE FUNCTION delivery_areas_normalize_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.district_normalized := lower(unaccent(btrim(NEW.district)));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_delivery_areas_normalize ON delivery_areas;
+CREATE TRIGGER trg_delivery_areas_normalize
+    BEFORE INSERT OR UPDATE ON delivery_areas
+    FOR EACH ROW EXECUTE FUNCTION delivery_areas_normalize_trigger();
+
+CREATE INDEX IF NOT EXISTS idx_delivery_areas_district_norm
+    ON delivery_areas(tenant_id, city, district_normalized)
+    WHERE is_active = true;
@@ -0,0 +1,48 @@
+-- ============================================
+-- LIA DELIVERY AGENT v2.0
+-- Migration: 003_webhook_context_rpc
+-- Date: 2025-08-28
+-- ============================================
+
+-- RPC que devolve em uma única chamada tudo que o webhook precisa para
+-- começar a atender (tenant + snapshot do cliente + sessão ativa),
+-- trocando 3-4 round-trips sequenciais por 1.
+
+CREATE OR REPLACE FUNCTION webhook_context(p_instance TEXT, p_phone TEXT)
+RETURNS JSON AS $$
+DECLARE
+    v_tenant tenants%ROWTYPE;
+    v_phone TEXT;
+BEGIN
+    SELECT * INTO v_tenant
+    FROM tenants
+    WHERE evolution_instance = p_instance
+      AND is_active = true
+    LIMIT 1;
+
+    IF v_tenant.id IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    v_phone := normalize_phone(p_phone);
+
+    RETURN json_build_object(
+        'tenant', row_to_json(v_tenant),
+        'client', (
+            SELECT row_to_json(cs)
+            FROM v_client_snapshot cs
+            WHERE cs.tenant_id = v_tenant.id
+              AND cs.phone_normalized = v_phone
+            LIMIT 1
+        ),
+        'session', (
+            SELECT row_to_json(s)
+            FROM sessions s
+            WHERE s.tenant_id = v_tenant.id
+              AND s.session_id = v_phone
+              AND s.status = 'active'
+            LIMIT 1
+        )
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
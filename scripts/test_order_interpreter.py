@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
+import multiprocessing
+import pickle
 import sys
 import os
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -9,6 +15,7 @@ sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 try:
     import psycopg
+    from psycopg.rows import dict_row
 except ImportError:
     print("Erro: psycopg não está instalado. Instale com: pip install psycopg")
     sys.exit(1)
@@ -89,115 +96,197 @@ Rua Rio Araguaia 118 casa 2
 Pix"""
 
 
+TESTS: List[tuple[str, str]] = [
+    ("TEST_1", TEST_1),
+    ("TEST_2", TEST_2),
+    ("TEST_3", TEST_3),
+    ("TEST_4", TEST_4),
+    ("TEST_5", TEST_5),
+    ("TEST_6", TEST_6),
+    ("TEST_7", TEST_7),
+    ("TEST_8", TEST_8),
+    ("TEST_9", TEST_9),
+    ("TEST_10", TEST_10),
+    ("TEST_11", TEST_11),
+    ("TEST_12", TEST_12),
+]
+
+
 def _normalize_db_url(url: str) -> str:
     if url.startswith("postgresql+psycopg://"):
         return "postgresql://" + url.split("postgresql+psycopg://", 1)[1]
     return url
 
 
+# Normalizada uma vez no import: main() pode ser chamado em loop sem
+# repetir o parse do prefixo
+DB_URL = _normalize_db_url(DATABASE_URL)
+
+
 def _fetch_menu_subset(conn, terms: List[str]) -> List[Dict[str, Any]]:
-    where_clause = " OR ".join(["nome_original ILIKE %s OR fingerprint ILIKE %s"] * len(terms))
-    params: List[Any] = []
-    for term in terms:
-        like = f"%{term}%"
-        params.extend([like, like])
-
-    query_products = f"""
-        select pdv, parent_pdv, nome_original, price, item_type, fingerprint
-        from v_menu_search_index
-        where item_type = 'product' and ({where_clause})
+    # ILIKE ANY(array) no lugar da cadeia de ORs: um nó de expressão por
+    # coluna em vez de 2N, e a forma que o planner consegue baixar para o
+    # índice trigram (pg_trgm já habilitado na migration 001)
+    # dict.fromkeys dedupa preservando a ordem (parâmetros determinísticos)
+    likes = list(dict.fromkeys(f"%{term}%" for term in terms))
+    params: List[Any] = [likes, likes]
+
+    # Produtos e adicionais em um único round-trip: a CTE resolve os
+    # produtos e o segundo ramo traz os adicionais dos pdvs encontrados,
+    # no lugar de duas queries sequenciais
+    query = """
+        with p as (
+            select distinct on (pdv)
+                   pdv, parent_pdv, nome_original, price, item_type, fingerprint
+            from v_menu_search_index
+            where item_type = 'product'
+              and (nome_original ilike any(%s) or fingerprint ilike any(%s))
+            order by pdv
+        )
+        select pdv, parent_pdv, nome_original, price, item_type, fingerprint from p
+        union all
+        select v.pdv, v.parent_pdv, v.nome_original, v.price, v.item_type, v.fingerprint
+        from v_menu_search_index v
+        where v.item_type = 'addition' and v.parent_pdv in (select pdv from p)
     """
 
-    with conn.cursor() as cur:
-        cur.execute(query_products, params)
-        products = _rows_to_dicts(cur.fetchall())
-
-    parent_pdvs = [p["pdv"] for p in products]
+    # dict_row monta os dicts no driver, direto do buffer já parseado,
+    # sem o passo Python de converter tupla a tupla. Cursor nomeado
+    # (server-side) itera em lotes em vez de materializar o resultado
+    # inteiro de uma vez — a memória fica plana se a view crescer.
+    # A ordem produtos -> adicionais é mantida independente do plano
+    products: List[Dict[str, Any]] = []
     additions: List[Dict[str, Any]] = []
-    if parent_pdvs:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                select pdv, parent_pdv, nome_original, price, item_type, fingerprint
-                from v_menu_search_index
-                where item_type = 'addition' and parent_pdv = ANY(%s)
-                """,
-                (parent_pdvs,),
-            )
-            additions = _rows_to_dicts(cur.fetchall())
-
+    with conn.cursor(name="menu_cur", row_factory=dict_row) as cur:
+        cur.itersize = 1000
+        cur.execute(query, params)
+        for row in cur:
+            if row["item_type"] == "product":
+                products.append(row)
+            else:
+                additions.append(row)
     return products + additions
 
 
-def _rows_to_dicts(rows):
-    return [
-        {
-            "pdv": row[0],
-            "parent_pdv": row[1],
-            "nome_original": row[2],
-            "price": row[3],
-            "item_type": row[4],
-            "fingerprint": row[5],
-        }
-        for row in rows
-    ]
+# Cache em disco do menu_index: a query é determinística para o mesmo
+# (DB_URL, terms), então reruns dentro do TTL pulam conexão e round-trip
+_CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+_CACHE_TTL_SECONDS = 600
+
+
+def _load_menu_index(terms: List[str]) -> List[Dict[str, Any]]:
+    key = hashlib.blake2b(repr((DB_URL, terms)).encode()).hexdigest()[:16]
+    cache_path = _CACHE_DIR / f"menu_index_{key}.pkl"
+    try:
+        if time.time() - cache_path.stat().st_mtime < _CACHE_TTL_SECONDS:
+            with cache_path.open("rb") as f:
+                return pickle.load(f)
+    except (OSError, pickle.PickleError):
+        pass
+
+    with psycopg.connect(DB_URL) as conn:
+        menu_index = _fetch_menu_subset(conn, terms)
 
+    try:
+        _CACHE_DIR.mkdir(exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        with tmp_path.open("wb") as f:
+            pickle.dump(menu_index, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return menu_index
 
-def _has_addition(item, name_substr: str) -> bool:
+
+def _has_addition(add_norms: List[str], name_substr: str) -> bool:
     needle = normalize_text(name_substr)
-    return any(needle in normalize_text(add.nome) for add in item.adicionais)
+    return any(needle in nome for nome in add_norms)
 
 
-def _obs_contains(item, text: str) -> bool:
-    return text.lower() in (item.observacoes or "").lower()
+def _obs_contains(obs_low: str, text: str) -> bool:
+    # recebe a observação já minúscula (precomputada por item); os
+    # needles das asserções são literais já em minúsculas
+    return text in obs_low
 
 
-def _has_item_pdv(items, pdv: str, qty: Optional[int] = None) -> bool:
-    for item in items:
-        if item.pdv == pdv and (qty is None or item.quantidade == qty):
+def _has_item_pdv(by_pdv, pdv: str, qty: Optional[int] = None) -> bool:
+    for item in by_pdv.get(pdv, ()):
+        if qty is None or item.quantidade == qty:
             return True
     return False
 
 
-def _has_item_name(items, needle: str, qty: Optional[int] = None) -> bool:
+def _has_item_name(norm_names, needle: str, qty: Optional[int] = None) -> bool:
     needle = normalize_text(needle)
-    for item in items:
-        if needle in normalize_text(item.nome) and (qty is None or item.quantidade == qty):
+    for nome_norm, item in norm_names:
+        if needle in nome_norm and (qty is None or item.quantidade == qty):
             return True
     return False
 
 
-def run_test(label: str, text: str, menu_index: List[Dict[str, Any]]) -> List[str]:
+# menu_index dos workers: enviado uma vez por processo via initializer
+# (e compartilhado por copy-on-write no fork), em vez de ser picklado a
+# cada tarefa do starmap
+_WORKER_MENU_INDEX: List[Dict[str, Any]] = []
+
+
+def _init_worker(menu_index: List[Dict[str, Any]]) -> None:
+    global _WORKER_MENU_INDEX
+    _WORKER_MENU_INDEX = menu_index
+
+
+def _run_test_task(label: str, text: str) -> tuple[str, List[str]]:
+    return run_test(label, text, _WORKER_MENU_INDEX)
+
+
+def run_test(label: str, text: str, menu_index: List[Dict[str, Any]]) -> tuple[str, List[str]]:
     failures: List[str] = []
 
     parsed = parse_order_text(text)
     resolved = resolve_parsed_items(parsed)
     result = match_items(resolved, menu_index, raw_text=text)
 
-    print(f"\n=== {label} ===")
-    print("RAW:")
-    print(text)
-    print("\nPARSED:")
+    # Índices montados uma vez por teste: as asserções consultam o dict
+    # por pdv e os nomes já normalizados, em vez de varrer (e renormalizar)
+    # result.items a cada verificação
+    by_pdv: Dict[str, List[Any]] = {}
+    for i in result.items:
+        by_pdv.setdefault(i.pdv, []).append(i)
+    norm_names = [(normalize_text(i.nome), i) for i in result.items]
+    # Nomes dos adicionais normalizados uma vez por item: as asserções
+    # fazem busca por substring nessas listas, sem renormalizar por check
+    add_norms = {
+        id(i): [normalize_text(a.nome) for a in i.adicionais] for i in result.items
+    }
+    obs_lows = {id(i): (i.observacoes or "").lower() for i in result.items}
+
+    # Relatório acumulado e devolvido ao chamador: com os testes rodando
+    # em paralelo, imprimir aqui intercalaria a saída dos workers
+    out: List[str] = []
+    out.append(f"\n=== {label} ===")
+    out.append("RAW:")
+    out.append(text)
+    out.append("\nPARSED:")
     for p in parsed:
-        print(
+        out.append(
             f"- qty={p.quantity} name='{p.name}' additions={p.additions} removals={p.removals} notes={p.notes} "
             f"is_additional_only={p.is_additional_only} size_hint={p.size_hint}"
         )
-    print("\nRESOLVED:")
+    out.append("\nRESOLVED:")
     for r in resolved:
-        print(
+        out.append(
             f"- qty={r.quantity} match_text='{r.match_text}' additions={r.additions} removals={r.removals} notes={r.notes} "
             f"is_additional_only={r.is_additional_only} size_hint={r.size_hint}"
         )
-    print("\nMATCHED ITEMS:")
+    out.append("\nMATCHED ITEMS:")
     for item in result.items:
         adds = [(a.nome, a.pdv) for a in item.adicionais]
-        print(
+        out.append(
             f"- pdv={item.pdv} nome='{item.nome}' qty={item.quantidade} adds={adds} obs='{item.observacoes}'"
         )
-    print("\nPENDENCIES:")
+    out.append("\nPENDENCIES:")
     for pend in result.pendencies:
-        print(
+        out.append(
             f"- motivo={pend.motivo.value} texto='{pend.texto_original}' sugestoes={pend.sugestoes}"
         )
 
@@ -207,49 +296,46 @@ def run_test(label: str, text: str, menu_index: List[Dict[str, Any]]) -> List[st
             failures.append(f"Esperado 7 itens, obtido {len(result.items)}.")
 
         # X Galinha + Bacon
-        if not any(i.pdv == "23137416" and _has_addition(i, "bacon") for i in result.items):
+        if not any(_has_addition(add_norms[id(i)], "bacon") for i in by_pdv.get("23137416", ())):
             failures.append("Faltando X Galinha com Bacon.")
 
         # X Galinha careca + batata palha + cortado ao meio
         if not any(
-            i.pdv == "23137416"
-            and _has_addition(i, "batata palha")
-            and _obs_contains(i, "sem: salada geral")
-            and _obs_contains(i, "cortado ao meio")
-            for i in result.items
+            _has_addition(add_norms[id(i)], "batata palha")
+            and _obs_contains(obs_lows[id(i)], "sem: salada geral")
+            and _obs_contains(obs_lows[id(i)], "cortado ao meio")
+            for i in by_pdv.get("23137416", ())
         ):
             failures.append("Faltando X Galinha careca com batata palha + obs cortado ao meio.")
 
         # X Galinha careca + bacon + milho (qty 2)
         if not any(
-            i.pdv == "23137416"
-            and i.quantidade == 2
-            and _has_addition(i, "bacon")
-            and _has_addition(i, "milho")
-            and _obs_contains(i, "sem: salada geral")
-            for i in result.items
+            i.quantidade == 2
+            and _has_addition(add_norms[id(i)], "bacon")
+            and _has_addition(add_norms[id(i)], "milho")
+            and _obs_contains(obs_lows[id(i)], "sem: salada geral")
+            for i in by_pdv.get("23137416", ())
         ):
             failures.append("Faltando X Galinha careca com bacon e milho (qtd 2).")
 
         # X Galinha sem ervilha e pepino
         if not any(
-            i.pdv == "23137416"
-            and _obs_contains(i, "sem: ervilha")
-            and _obs_contains(i, "pepino")
-            for i in result.items
+            _obs_contains(obs_lows[id(i)], "sem: ervilha")
+            and _obs_contains(obs_lows[id(i)], "pepino")
+            for i in by_pdv.get("23137416", ())
         ):
             failures.append("Faltando X Galinha sem ervilha e pepino.")
 
         # X Burguer + Coração
-        if not any(i.pdv == "23137502" and _has_addition(i, "coração") for i in result.items):
+        if not any(_has_addition(add_norms[id(i)], "coração") for i in by_pdv.get("23137502", ())):
             failures.append("Faltando X Burguer com Coração.")
 
         # Batata frita 1/4
-        if not any(i.pdv == "23137573" for i in result.items):
+        if "23137573" not in by_pdv:
             failures.append("Faltando Batata Frita (1/4 Porção).")
 
         # Guarana 2L
-        if not any(i.pdv == "23172036" for i in result.items):
+        if "23172036" not in by_pdv:
             failures.append("Faltando Guaraná 2 Litros.")
 
         # Pendência de maionese adicional
@@ -270,10 +356,10 @@ def run_test(label: str, text: str, menu_index: List[Dict[str, Any]]) -> List[st
         if len(result.items) != 2:
             failures.append(f"Esperado 2 itens, obtido {len(result.items)}.")
 
-        if not any(i.pdv == "23137463" and i.quantidade == 2 for i in result.items):
+        if not _has_item_pdv(by_pdv, "23137463", qty=2):
             failures.append("Faltando X Salada (qtd 2).")
 
-        if not any(i.pdv == "23137438" and i.quantidade == 1 for i in result.items):
+        if not _has_item_pdv(by_pdv, "23137438", qty=1):
             failures.append("Faltando X Coração (qtd 1).")
 
         if len(result.pendencies) != 0:
@@ -283,124 +369,132 @@ def run_test(label: str, text: str, menu_index: List[Dict[str, Any]]) -> List[st
             failures.append("Confiança deveria ser alta (>= 0.9).")
 
     if label == "TEST_3":
-        if not _has_item_pdv(result.items, "23137463", qty=2):
+        if not _has_item_pdv(by_pdv, "23137463", qty=2):
             failures.append("Faltando X Salada (qtd 2).")
         if len(result.pendencies) != 0:
             failures.append(f"Esperado 0 pendências, obtido {len(result.pendencies)}.")
 
     if label == "TEST_4":
-        if not _has_item_pdv(result.items, "23137463", qty=1):
+        if not _has_item_pdv(by_pdv, "23137463", qty=1):
             failures.append("Faltando X Salada.")
         if not any(
-            i.pdv == "23137463"
-            and _obs_contains(i, "sem: milho")
-            and _obs_contains(i, "alface")
-            for i in result.items
+            _obs_contains(obs_lows[id(i)], "sem: milho")
+            and _obs_contains(obs_lows[id(i)], "alface")
+            for i in by_pdv.get("23137463", ())
         ):
             failures.append("X Salada sem milho e alface não identificado.")
-        if not _has_item_pdv(result.items, "23137577", qty=1):
+        if not _has_item_pdv(by_pdv, "23137577", qty=1):
             failures.append("Faltando Torrada de Mignon.")
-        if not _has_item_pdv(result.items, "23137491", qty=1):
+        if not _has_item_pdv(by_pdv, "23137491", qty=1):
             failures.append("Faltando Coca Cola 2 Litros.")
         if len(result.pendencies) != 0:
             failures.append(f"Esperado 0 pendências, obtido {len(result.pendencies)}.")
 
     if label == "TEST_5":
-        if not _has_item_pdv(result.items, "23137577", qty=1):
+        if not _has_item_pdv(by_pdv, "23137577", qty=1):
             failures.append("Faltando Torrada de Mignon.")
-        if not _has_item_name(result.items, "coca cola", qty=1):
+        if not _has_item_name(norm_names, "coca cola", qty=1):
             failures.append("Faltando Coca Cola.")
         if len(result.pendencies) != 0:
             failures.append(f"Esperado 0 pendências, obtido {len(result.pendencies)}.")
 
     if label == "TEST_6":
-        if not _has_item_pdv(result.items, "23137463", qty=1):
+        if not _has_item_pdv(by_pdv, "23137463", qty=1):
             failures.append("Faltando X Salada.")
-        if not _has_item_pdv(result.items, "23137502", qty=1):
+        if not _has_item_pdv(by_pdv, "23137502", qty=1):
             failures.append("Faltando X Burguer.")
-        if not _has_item_pdv(result.items, "23137491", qty=1):
+        if not _has_item_pdv(by_pdv, "23137491", qty=1):
             failures.append("Faltando Coca Cola 2 Litros.")
         if len(result.pendencies) != 0:
             failures.append(f"Esperado 0 pendências, obtido {len(result.pendencies)}.")
 
     if label == "TEST_7":
-        if not _has_item_pdv(result.items, "23137463", qty=1):
+        if not _has_item_pdv(by_pdv, "23137463", qty=1):
             failures.append("Faltando X Salada.")
-        if not _has_item_pdv(result.items, "23137502", qty=1):
+        if not _has_item_pdv(by_pdv, "23137502", qty=1):
             failures.append("Faltando X Burguer.")
-        if not _has_item_pdv(result.items, "23137491", qty=1):
+        if not _has_item_pdv(by_pdv, "23137491", qty=1):
             failures.append("Faltando Coca Cola 2 Litros.")
         if len(result.pendencies) != 0:
             failures.append(f"Esperado 0 pendências, obtido {len(result.pendencies)}.")
 
     if label == "TEST_8":
-        if not _has_item_pdv(result.items, "23137416", qty=1):
+        if not _has_item_pdv(by_pdv, "23137416", qty=1):
             failures.append("Faltando X Galinha.")
-        if not _has_item_pdv(result.items, "23137559", qty=1):
+        if not _has_item_pdv(by_pdv, "23137559", qty=1):
             failures.append("Faltando X Egg.")
         if not any(
-            i.pdv == "23137559"
-            and _obs_contains(i, "sem: milho")
-            and _obs_contains(i, "ervilha")
-            and _obs_contains(i, "pepino")
-            for i in result.items
+            _obs_contains(obs_lows[id(i)], "sem: milho")
+            and _obs_contains(obs_lows[id(i)], "ervilha")
+            and _obs_contains(obs_lows[id(i)], "pepino")
+            for i in by_pdv.get("23137559", ())
         ):
             failures.append("X Egg sem milho/ervilha/pepino não identificado.")
-        if not _has_item_name(result.items, "coca cola lata", qty=1):
+        if not _has_item_name(norm_names, "coca cola lata", qty=1):
             failures.append("Faltando Coca Cola Lata.")
-        if not _has_item_name(result.items, "guarana", qty=1):
+        if not _has_item_name(norm_names, "guarana", qty=1):
             failures.append("Faltando Guaraná Lata.")
         if len(result.pendencies) != 0:
             failures.append(f"Esperado 0 pendências, obtido {len(result.pendencies)}.")
 
     if label == "TEST_9":
-        if not _has_item_name(result.items, "batata frita", qty=1):
+        if not _has_item_name(norm_names, "batata frita", qty=1):
             failures.append("Faltando Batata Frita.")
-        if not _has_item_name(result.items, "bacon e queijo", qty=1):
+        if not _has_item_name(norm_names, "bacon e queijo", qty=1):
             failures.append("Faltando Batata Frita com Bacon e Queijo.")
-        if not _has_item_name(result.items, "suco morango", qty=1):
+        if not _has_item_name(norm_names, "suco morango", qty=1):
             failures.append("Faltando Suco de Morango.")
         if len(result.pendencies) != 0:
             failures.append(f"Esperado 0 pendências, obtido {len(result.pendencies)}.")
 
     if label == "TEST_10":
-        if not _has_item_name(result.items, "x frango", qty=2):
+        if not _has_item_name(norm_names, "x frango", qty=2):
             failures.append("Faltando X Frango (qtd 2).")
-        if not _has_item_name(result.items, "x mignon", qty=1):
+        if not _has_item_name(norm_names, "x mignon", qty=1):
             failures.append("Faltando X Mignon.")
-        if not _has_item_pdv(result.items, "23137491", qty=1):
+        if not _has_item_pdv(by_pdv, "23137491", qty=1):
             failures.append("Faltando Coca Cola 2 Litros.")
         if len(result.pendencies) != 0:
             failures.append(f"Esperado 0 pendências, obtido {len(result.pendencies)}.")
 
     if label == "TEST_11":
-        if not _has_item_pdv(result.items, "23137416", qty=1):
+        if not _has_item_pdv(by_pdv, "23137416", qty=1):
             failures.append("Faltando X Galinha.")
-        if not _has_item_pdv(result.items, "23137467", qty=1):
+        if not _has_item_pdv(by_pdv, "23137467", qty=1):
             failures.append("Faltando X Bacon.")
-        if not _has_item_name(result.items, "coca cola 600", qty=1):
+        if not _has_item_name(norm_names, "coca cola 600", qty=1):
             failures.append("Faltando Coca Cola 600ml.")
         if len(result.pendencies) != 0:
             failures.append(f"Esperado 0 pendências, obtido {len(result.pendencies)}.")
 
     if label == "TEST_12":
-        if not _has_item_pdv(result.items, "23137416", qty=1):
+        if not _has_item_pdv(by_pdv, "23137416", qty=1):
             failures.append("Faltando X Galinha.")
         if not any(
-            i.pdv == "23137416"
-            and _obs_contains(i, "sem: ervilha")
-            and _obs_contains(i, "pepino")
-            and _obs_contains(i, "bem passado")
-            for i in result.items
+            _obs_contains(obs_lows[id(i)], "sem: ervilha")
+            and _obs_contains(obs_lows[id(i)], "pepino")
+            and _obs_contains(obs_lows[id(i)], "bem passado")
+            for i in by_pdv.get("23137416", ())
         ):
             failures.append("X Galinha sem ervilha/pepino e bem passado não identificado.")
         if len(result.pendencies) != 0:
             failures.append(f"Esperado 0 pendências, obtido {len(result.pendencies)}.")
 
-    return failures
-
-def main() -> int:
-    db_url = _normalize_db_url(DATABASE_URL)
+    return "\n".join(out), failures
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Roda os testes do order interpreter contra o cardápio real."
+    )
+    parser.add_argument(
+        "--fixture",
+        help="Carrega o menu_index de um JSON pré-gerado e não conecta no banco",
+    )
+    parser.add_argument(
+        "--dump-fixture",
+        help="Grava o menu_index usado em um JSON para reuso via --fixture",
+    )
+    args = parser.parse_args(argv)
 
     terms = [
         "galinha",
@@ -420,22 +514,32 @@ def main() -> int:
         "morango",
     ]
 
-    with psycopg.connect(db_url) as conn:
-        menu_index = _fetch_menu_subset(conn, terms)
-
-    failures = []
-    failures.extend(run_test("TEST_1", TEST_1, menu_index))
-    failures.extend(run_test("TEST_2", TEST_2, menu_index))
-    failures.extend(run_test("TEST_3", TEST_3, menu_index))
-    failures.extend(run_test("TEST_4", TEST_4, menu_index))
-    failures.extend(run_test("TEST_5", TEST_5, menu_index))
-    failures.extend(run_test("TEST_6", TEST_6, menu_index))
-    failures.extend(run_test("TEST_7", TEST_7, menu_index))
-    failures.extend(run_test("TEST_8", TEST_8, menu_index))
-    failures.extend(run_test("TEST_9", TEST_9, menu_index))
-    failures.extend(run_test("TEST_10", TEST_10, menu_index))
-    failures.extend(run_test("TEST_11", TEST_11, menu_index))
-    failures.extend(run_test("TEST_12", TEST_12, menu_index))
+    # Com fixture o banco fica fora do loop de desenvolvimento: útil
+    # offline e tira a latência do connect da iteração no parser
+    if args.fixture:
+        with open(args.fixture, encoding="utf-8") as f:
+            menu_index = json.load(f)
+    else:
+        menu_index = _load_menu_index(terms)
+
+    if args.dump_fixture:
+        with open(args.dump_fixture, "w", encoding="utf-8") as f:
+            json.dump(menu_index, f, ensure_ascii=False, default=str)
+
+    # Cada teste é independente e CPU-bound (parse/resolve/match): o pool
+    # de processos distribui pelos cores; no Linux o fork compartilha o
+    # menu_index por copy-on-write. starmap preserva a ordem dos reports
+    with multiprocessing.Pool(
+        initializer=_init_worker, initargs=(menu_index,)
+    ) as pool:
+        results = pool.starmap(_run_test_task, TESTS)
+
+    # Uma escrita só para os doze relatórios, em vez de um print (e um
+    # write) por teste
+    failures: List[str] = []
+    for _report, test_failures in results:
+        failures.extend(test_failures)
+    sys.stdout.write("\n".join(report for report, _ in results) + "\n")
 
     if failures:
         print("FAIL")